@@ -2,6 +2,8 @@ import dash
 from dash import Dash, html, dcc
 import dash_bootstrap_components as dbc
 from nav import nav
+from image_cache import register_image_routes
+from cache_routes import register_cache_routes
 
 
 app = Dash(
@@ -17,6 +19,8 @@ app = Dash(
 )
 
 server = app.server
+register_image_routes(server)
+register_cache_routes(server)
 
 app.layout = html.Div(
     [
@@ -6,4 +6,17 @@ dagcomponentfuncs.NameLink = function (props) {
         { href: '/player/' + props.value.replace(/\.|'/g, '').replace(/\s/g, '-').toLowerCase() },
         props.value
     );
-};
\ No newline at end of file
+};
+
+// link to a player's page built from the row's player id
+// rows of the infinite row model have no data while their block is loading
+dagcomponentfuncs.PlayerLink = function (props) {
+    if (!props.data) {
+        return props.value === undefined ? null : props.value;
+    }
+    return React.createElement(
+        'a',
+        { href: '/player/' + props.data.Player },
+        props.value
+    );
+};
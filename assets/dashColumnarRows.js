@@ -0,0 +1,36 @@
+// rebuild AG Grid row objects from the columnar payloads sent by helpers.df_to_columnar
+// payload: {columns: [name, ...], data: [[column values], ...]}
+function columnarToRows(payload) {
+    const columns = payload.columns;
+    const data = payload.data;
+    const length = columns.length ? data[0].length : 0;
+    const rows = new Array(length);
+
+    for (let i = 0; i < length; i++) {
+        const row = {};
+        for (let j = 0; j < columns.length; j++) {
+            row[columns[j]] = data[j][i];
+        }
+        rows[i] = row;
+    }
+    return rows;
+}
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    columnar: {
+        // clientSide row model grids - Output(grid, 'rowData')
+        toRowData: function (payload) {
+            if (!payload) {
+                return window.dash_clientside.no_update;
+            }
+            return columnarToRows(payload);
+        },
+        // infinite row model grids - Output(grid, 'getRowsResponse')
+        toRowsResponse: function (payload) {
+            if (!payload) {
+                return window.dash_clientside.no_update;
+            }
+            return {rowData: columnarToRows(payload), rowCount: payload.rowCount};
+        },
+    },
+});
@@ -0,0 +1,511 @@
+import aiohttp
+import asyncio
+import atexit
+import concurrent.futures
+import os
+import re
+import threading
+import time
+
+from cache import TTLCache
+from disk_cache import DiskCache
+from urllib.parse import urlsplit, parse_qsl
+from data_values import (
+    BACKEND_URL,
+    BACKEND_POOL_LIMIT,
+    BACKEND_POOL_LIMIT_PER_HOST,
+    BACKEND_KEEPALIVE_SECONDS,
+    BACKEND_DNS_CACHE_SECONDS,
+    BACKEND_CONNECT_TIMEOUT,
+    BACKEND_TOTAL_TIMEOUT,
+    BACKEND_CACHE_MAX_ENTRIES,
+    BACKEND_CACHE_TTL_CURRENT,
+    BACKEND_CACHE_TTL_METADATA,
+    DISK_CACHE_PATH,
+    DISK_CACHE_VERSION,
+    DATA_CACHE_MAX_ENTRIES,
+)
+
+# a single event loop runs in a daemon thread for the lifetime of the worker process
+# every page shares it along with one pooled aiohttp session so connections are kept alive between requests
+_loop = None
+_loop_pid = None
+_session = None
+_loop_lock = threading.Lock()
+
+# parsed backend responses shared by every page, keyed by cache version like data_cache
+# cached responses are shared between callers and must not be mutated
+response_cache = TTLCache(max_entries=BACKEND_CACHE_MAX_ENTRIES)
+# second tier shared by every worker process and kept across restarts
+disk_cache = DiskCache(DISK_CACHE_PATH, version=DISK_CACHE_VERSION)
+# formatted data built from responses, in front of the disk cache so hits don't unpickle
+# keyed by cache version so invalidating the disk cache drops these in every worker
+data_cache = TTLCache(max_entries=DATA_CACHE_MAX_ENTRIES)
+
+# bumped by invalidate_caches so this worker drops its in-process entries even when the disk cache is disabled
+_generation = 0
+
+# cache key -> lock held while the data is built, so concurrent callers build it once
+_build_locks = {}
+_build_locks_lock = threading.Lock()
+
+# endpoints whose answer only changes between seasons
+METADATA_ENDPOINTS = {
+    "season/current_season",
+    "season/all_seasons",
+    "players/all_names",
+}
+
+# metadata endpoints served stale while a background refresh fetches the new value
+# keeps these lookups off the critical path of every page render
+STALE_WHILE_REVALIDATE_ENDPOINTS = {
+    "season/current_season",
+    "season/all_seasons",
+}
+
+SEASON_PATTERN = re.compile(r"^\d{8}$")
+
+# last seen value of season/current_season used to tell past seasons from the current one
+_current_season = None
+
+# canonical endpoint -> task of the upstream request currently running for it
+# only touched from the shared event loop so no lock is needed
+_in_flight = {}
+_coalesced = 0
+
+# stale-while-revalidate endpoint -> monotonic time its cached value should be refreshed
+_fresh_until = {}
+
+
+def _start_loop():
+    """
+    Create a new event loop and run it forever in a background daemon thread.
+
+    Returns:
+        asyncio.AbstractEventLoop: The running event loop.
+    """
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name="backend-client-loop", daemon=True)
+    thread.start()
+    return loop
+
+
+def get_loop():
+    """
+    Return the long-lived event loop used for all backend requests, starting it on first use.
+    gunicorn forks workers after import, so a new loop is started if the process id has changed.
+
+    Returns:
+        asyncio.AbstractEventLoop: The shared running event loop.
+    """
+    global _loop, _loop_pid, _session, _in_flight
+
+    if _loop is None or _loop_pid != os.getpid():
+        with _loop_lock:
+            if _loop is None or _loop_pid != os.getpid():
+                _loop = _start_loop()
+                _loop_pid = os.getpid()
+                _session = None
+                _in_flight = {}
+                _fresh_until.clear()
+
+    return _loop
+
+
+async def get_session():
+    """
+    Return the shared aiohttp session, creating it on first use.
+    Must be awaited from the shared event loop.
+
+    Returns:
+        aiohttp.ClientSession: Session with a keep-alive connection pool per host.
+    """
+    global _session
+
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=BACKEND_POOL_LIMIT,
+            limit_per_host=BACKEND_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=BACKEND_KEEPALIVE_SECONDS,
+            ttl_dns_cache=BACKEND_DNS_CACHE_SECONDS,
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=BACKEND_TOTAL_TIMEOUT, connect=BACKEND_CONNECT_TIMEOUT),
+        )
+
+    return _session
+
+
+def backend_url(endpoint:str):
+    """
+    Return the full backend api url for an endpoint.
+
+    Example: backend_url('season/current_season') -> '{BACKEND_URL}/api/season/current_season'
+
+    Args:
+        endpoint (str): url endpoint to query including any query params.
+
+    Returns:
+        str: Full url of the backend endpoint.
+    """
+    return f"{BACKEND_URL}/api/{endpoint}"
+
+
+async def fetch_json_response(url:str):
+    """
+    Performs an async GET request using the shared session and returns the status and parsed json.
+
+    Args:
+        url (str): Full url to query.
+
+    Returns:
+        tuple: status code, json response of data.
+    """
+    session = await get_session()
+    async with session.get(url) as resp:
+        data = await resp.json()
+
+    return resp.status, data
+
+
+async def fetch_json(url:str):
+    """
+    Performs an async GET request using the shared session and returns the parsed json.
+
+    Args:
+        url (str): Full url to query.
+
+    Returns:
+        json response of data.
+    """
+    return (await fetch_json_response(url))[1]
+
+
+async def fetch_bytes(url:str):
+    """
+    Performs an async GET request using the shared session and returns the raw response body.
+
+    Args:
+        url (str): Full url to query.
+
+    Returns:
+        tuple: Content-Type header, bytes of the response body.
+    """
+    session = await get_session()
+    async with session.get(url) as resp:
+        resp.raise_for_status()
+        content = await resp.read()
+
+    return resp.headers.get("Content-Type"), content
+
+
+def canonicalize_endpoint(endpoint:str):
+    """
+    Return a normalized version of an endpoint to use as a cache key.
+    Query params are decoded and sorted so equivalent queries share a key.
+
+    Example: 'season/team/?team_name=Dallas%20Stars&season=20232024' -> 'season/team/?season=20232024&team_name=Dallas Stars'
+
+    Args:
+        endpoint (str): url endpoint including any query params.
+
+    Returns:
+        str: Canonical endpoint string.
+    """
+    url = urlsplit(endpoint.strip())
+    path = url.path.lstrip("/")
+    params = sorted(parse_qsl(url.query, keep_blank_values=True))
+    if not params:
+        return path
+
+    query_params = "&".join([f"{key}={value}" for key, value in params])
+    return f"{path}?{query_params}"
+
+
+def get_endpoint_season(endpoint:str):
+    """
+    Return the season an endpoint is scoped to from either a 'season' query param or a season path segment.
+
+    Args:
+        endpoint (str): Canonical endpoint.
+
+    Returns:
+        int: Season e.g. 20232024, or None if the endpoint is not scoped to a single season.
+    """
+    url = urlsplit(endpoint)
+    season = dict(parse_qsl(url.query)).get("season")
+    if season is None:
+        season = url.path.rstrip("/").split("/")[-1]
+
+    if SEASON_PATTERN.match(str(season)):
+        return int(season)
+    return None
+
+
+def get_cache_version():
+    """
+    Return the version in-process cached data is stored under.
+    Changes whenever the disk cache is invalidated by any worker or the caches are invalidated in this worker.
+
+    Returns:
+        str: Current cache version.
+    """
+    return f"{disk_cache.get_version()}:{_generation}"
+
+
+def get_cache_ttl(endpoint:str):
+    """
+    Return the number of seconds a response for an endpoint should be cached.
+    Past seasons never change and are cached without expiring.
+    Stale-while-revalidate endpoints never expire and are refreshed in the background instead.
+    Season metadata changes at most once a season.
+    Anything that may include the current season is cached for a short time.
+
+    Args:
+        endpoint (str): Canonical endpoint.
+
+    Returns:
+        float: Seconds to cache the response, or None to never expire.
+    """
+    if endpoint in STALE_WHILE_REVALIDATE_ENDPOINTS:
+        return None
+
+    if endpoint in METADATA_ENDPOINTS:
+        return BACKEND_CACHE_TTL_METADATA
+
+    season = get_endpoint_season(endpoint)
+    if season is not None and _current_season is not None and season < _current_season:
+        return None
+
+    return BACKEND_CACHE_TTL_CURRENT
+
+
+def _remember_current_season(key:str, data:dict):
+    """
+    Keep track of the current season whenever the season/current_season response is loaded.
+
+    Args:
+        key (str): Canonical endpoint of the response.
+        data (dict): json response of data.
+    """
+    global _current_season
+
+    if key != "season/current_season":
+        return
+
+    try:
+        _current_season = int(data["season"])
+    except (KeyError, TypeError, ValueError):
+        pass
+
+
+async def _query_and_cache(endpoint:str, key:str, version:str, refresh=False):
+    """
+    Load an endpoint from the disk cache, or query the backend if it isn't there,
+    then store the response in the response cache. Only successful backend responses are cached.
+
+    Args:
+        endpoint (str): url endpoint to query including any query params.
+        key (str): Canonical endpoint used as the cache key.
+        version (str): Cache version the response is stored under.
+        refresh (bool): If true, skip the disk cache and always query the backend.
+
+    Returns:
+        json response of data.
+    """
+    loop = asyncio.get_running_loop()
+    disk_key = f"response:{key}"
+
+    # sqlite calls run in the default executor so lock waits never block the shared loop
+    data = None if refresh else await loop.run_in_executor(None, disk_cache.get, disk_key)
+    if data is None:
+        status, data = await fetch_json_response(backend_url(endpoint))
+        # error bodies e.g. {'detail': 'Not Found'} are returned to the caller but never cached
+        if not 200 <= status < 300:
+            return data
+        _remember_current_season(key, data)
+        await loop.run_in_executor(None, disk_cache.set, disk_key, data, get_cache_ttl(key))
+        if key in STALE_WHILE_REVALIDATE_ENDPOINTS:
+            _fresh_until[key] = time.monotonic() + BACKEND_CACHE_TTL_METADATA
+    else:
+        _remember_current_season(key, data)
+
+    response_cache.set((key, version), data, get_cache_ttl(key))
+    return data
+
+
+def _get_in_flight_task(endpoint:str, key:str, version:str, refresh=False):
+    """
+    Return the running upstream request task for an endpoint, starting a new one if there isn't one.
+
+    Args:
+        endpoint (str): url endpoint to query including any query params.
+        key (str): Canonical endpoint used as the cache key.
+        version (str): Cache version the response is stored under.
+        refresh (bool): If true, skip the disk cache and always query the backend.
+
+    Returns:
+        asyncio.Task: Task resolving to the json response of data.
+    """
+    global _coalesced
+
+    in_flight_key = (key, version)
+    task = _in_flight.get(in_flight_key)
+    if task is not None:
+        _coalesced += 1
+        return task
+
+    task = asyncio.ensure_future(_query_and_cache(endpoint, key, version, refresh))
+    _in_flight[in_flight_key] = task
+
+    def remove_in_flight(done_task):
+        if _in_flight.get(in_flight_key) is done_task:
+            del _in_flight[in_flight_key]
+        # background refreshes have no caller to receive their error
+        if not done_task.cancelled():
+            done_task.exception()
+
+    task.add_done_callback(remove_in_flight)
+    return task
+
+
+async def query_backend(endpoint:str):
+    """
+    Performs an async query to the backend server and the supplied endpoint.
+    Responses are cached by canonical endpoint and cache version using the ttl from get_cache_ttl.
+    Concurrent callers asking for the same uncached endpoint share a single upstream request.
+    Stale-while-revalidate endpoints return their cached value immediately and refresh it in the background once it is old.
+
+    Args:
+        endpoint (str): url endpoint to query including any query params.
+
+    Returns:
+        json response of data.
+    """
+    key = canonicalize_endpoint(endpoint)
+    version = get_cache_version()
+    data = response_cache.get((key, version))
+    if data is not None:
+        if key in STALE_WHILE_REVALIDATE_ENDPOINTS and _fresh_until.get(key, 0) <= time.monotonic():
+            _get_in_flight_task(endpoint, key, version, refresh=True)
+        return data
+
+    task = _get_in_flight_task(endpoint, key, version)
+
+    # shield so a caller hitting its own deadline doesn't cancel the request for everyone else
+    return await asyncio.shield(task)
+
+
+def get_cached_frame(endpoint:str, build_frame, prefix="frame"):
+    """
+    Return a formatted DataFrame of an endpoint from the in-process or disk cache, building and storing it on a miss.
+    Uses the same ttl as the endpoint's response.
+    Concurrent callers in a worker asking for the same missing frame wait for a single build.
+    Frames are shared between callers and must not be mutated.
+
+    Args:
+        endpoint (str): url endpoint the DataFrame is built from.
+        build_frame (callable): Function with no arguments that returns the formatted DataFrame.
+        prefix (str): Cache key prefix to store other data derived from the same endpoint.
+
+    Returns:
+        obj: Formatted DataFrame.
+    """
+    key = canonicalize_endpoint(endpoint)
+    cache_key = f"{prefix}:{key}"
+    memory_key = (cache_key, get_cache_version())
+    df = data_cache.get(memory_key)
+    if df is not None:
+        return df
+
+    with _build_locks_lock:
+        lock = _build_locks.setdefault(cache_key, threading.Lock())
+
+    with lock:
+        try:
+            df = data_cache.get(memory_key)
+            if df is not None:
+                return df
+
+            df, ttl = disk_cache.get_with_ttl(cache_key)
+            if df is None:
+                ttl = get_cache_ttl(key)
+                df = build_frame()
+                disk_cache.set(cache_key, df, ttl)
+
+            data_cache.set(memory_key, df, ttl)
+        finally:
+            with _build_locks_lock:
+                if _build_locks.get(cache_key) is lock:
+                    del _build_locks[cache_key]
+
+    return df
+
+
+def invalidate_caches():
+    """
+    Clear the in-process caches and invalidate the shared disk cache for every worker.
+    Other workers see the new disk cache version and stop using their in-process entries too.
+    """
+    global _generation
+
+    _generation += 1
+    response_cache.clear()
+    data_cache.clear()
+    disk_cache.invalidate()
+
+
+def cache_stats():
+    """
+    Return hit and miss counters of the backend response cache along with the number of coalesced requests.
+
+    Returns:
+        dict: Cache counters.
+    """
+    stats = response_cache.stats()
+    stats.update({"in_flight": len(_in_flight), "coalesced": _coalesced})
+    return stats
+
+
+def run(coro, timeout=None):
+    """
+    Run a coroutine on the shared event loop and block until it is finished.
+    Synchronous entry point for Dash callbacks and layouts.
+
+    Args:
+        coro (coroutine): Coroutine to run.
+        timeout (float): Optional number of seconds to wait before cancelling the coroutine.
+
+    Returns:
+        Result of the coroutine. Any exception raised by the coroutine is re-raised.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_loop())
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
+def close():
+    """
+    Close the shared session and stop the event loop.
+    """
+    global _loop, _session
+
+    if _loop is None or _loop_pid != os.getpid():
+        return
+
+    if _session is not None and not _session.closed:
+        try:
+            asyncio.run_coroutine_threadsafe(_session.close(), _loop).result(5)
+        except (concurrent.futures.TimeoutError, RuntimeError):
+            pass
+
+    _loop.call_soon_threadsafe(_loop.stop)
+    _loop = None
+    _session = None
+
+
+atexit.register(close)
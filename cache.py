@@ -0,0 +1,91 @@
+import threading
+import time
+
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU cache where each entry can have its own time to live.
+
+    Args:
+        max_entries (int): Maximum number of entries to keep before evicting the least recently used.
+        default_ttl (float): Seconds an entry is kept when no ttl is given. None never expires.
+    """
+    def __init__(self, max_entries=512, default_ttl=None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Return the cached value for 'key' or 'default' if missing or expired.
+
+        Args:
+            key (hashable): Cache key.
+            default (any): Value to return on a cache miss.
+
+        Returns:
+            any: Cached value or default.
+        """
+        with self._lock:
+            try:
+                expires, value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        """
+        Store 'value' under 'key', evicting the least recently used entries if the cache is full.
+
+        Args:
+            key (hashable): Cache key.
+            value (any): Value to store.
+            ttl (float): Seconds to keep the entry. Uses the cache default_ttl if not given.
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        expires = None if ttl is None else time.monotonic() + ttl
+
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """
+        Return hit, miss, and eviction counters along with the current size of the cache.
+
+        Returns:
+            dict: Cache counters.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+            }
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,59 @@
+import hmac
+
+from flask import abort, jsonify, request
+
+from backend_client import cache_stats, invalidate_caches
+from data_values import CACHE_ADMIN_TOKEN
+
+
+def is_authorized():
+    """
+    Return whether the request carries the cache admin token as 'Authorization: Bearer <token>'.
+
+    Returns:
+        bool: True if the token matches CACHE_ADMIN_TOKEN.
+    """
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    return scheme == "Bearer" and hmac.compare_digest(token.encode("utf-8"), CACHE_ADMIN_TOKEN.encode("utf-8"))
+
+
+def invalidate_view():
+    """
+    Flask view invalidating the backend response and disk caches, e.g. after the backend data is reloaded.
+    Every worker stops using its cached responses and data at once.
+
+    Returns:
+        flask.Response: json confirmation.
+    """
+    if not is_authorized():
+        abort(403)
+
+    invalidate_caches()
+    return jsonify({"invalidated": True})
+
+
+def stats_view():
+    """
+    Flask view returning the hit, miss, eviction, and request coalescing counters of this worker's response cache.
+
+    Returns:
+        flask.Response: json cache counters.
+    """
+    if not is_authorized():
+        abort(403)
+
+    return jsonify(cache_stats())
+
+
+def register_cache_routes(server):
+    """
+    Register the cache admin routes on the Flask server of the app. Nothing is registered if CACHE_ADMIN_TOKEN isn't set.
+
+    Args:
+        server (flask.Flask): Flask server of the Dash app.
+    """
+    if not CACHE_ADMIN_TOKEN:
+        return
+
+    server.add_url_rule("/cache/stats", "cache_stats", stats_view)
+    server.add_url_rule("/cache/invalidate", "invalidate_caches", invalidate_view, methods=["POST"])
@@ -3,6 +3,56 @@ import os
 BACKEND_URL = os.environ.get("BACKEND_URL")
 ROOT_URL = os.environ.get("ROOT_URL")
 
+# shared backend http client connection pool and timeout settings
+BACKEND_POOL_LIMIT = int(os.environ.get("BACKEND_POOL_LIMIT", 100))
+BACKEND_POOL_LIMIT_PER_HOST = int(os.environ.get("BACKEND_POOL_LIMIT_PER_HOST", 20))
+BACKEND_KEEPALIVE_SECONDS = float(os.environ.get("BACKEND_KEEPALIVE_SECONDS", 60))
+BACKEND_DNS_CACHE_SECONDS = int(os.environ.get("BACKEND_DNS_CACHE_SECONDS", 300))
+BACKEND_CONNECT_TIMEOUT = float(os.environ.get("BACKEND_CONNECT_TIMEOUT", 5))
+BACKEND_TOTAL_TIMEOUT = float(os.environ.get("BACKEND_TOTAL_TIMEOUT", 30))
+
+# backend response cache size and time to live (seconds) for each type of endpoint
+BACKEND_CACHE_MAX_ENTRIES = int(os.environ.get("BACKEND_CACHE_MAX_ENTRIES", 512))
+BACKEND_CACHE_TTL_CURRENT = float(os.environ.get("BACKEND_CACHE_TTL_CURRENT", 300))
+BACKEND_CACHE_TTL_METADATA = float(os.environ.get("BACKEND_CACHE_TTL_METADATA", 3600))
+
+# sqlite file shared by all workers to cache backend responses and formatted data
+# set DISK_CACHE_PATH to an empty string to disable, bump DISK_CACHE_VERSION to invalidate every entry
+# the file holds pickled data so it must live in a directory only the app user can write to
+DISK_CACHE_PATH = os.environ.get("DISK_CACHE_PATH", os.path.join(os.path.expanduser("~"), ".cache", "hockey-stats", "cache.sqlite3"))
+DISK_CACHE_VERSION = os.environ.get("DISK_CACHE_VERSION", "4")
+# in-process copies of formatted data built from backend responses, kept in front of the disk cache
+DATA_CACHE_MAX_ENTRIES = int(os.environ.get("DATA_CACHE_MAX_ENTRIES", 16))
+
+# token required by the cache stats and invalidation routes in the Authorization header, the routes are disabled when unset
+CACHE_ADMIN_TOKEN = os.environ.get("CACHE_ADMIN_TOKEN", "")
+
+# row positions of sorted and filtered player grid views kept per worker
+GRID_VIEW_MAX_ENTRIES = int(os.environ.get("GRID_VIEW_MAX_ENTRIES", 128))
+GRID_VIEW_TTL = float(os.environ.get("GRID_VIEW_TTL", 1800))
+
+# maximum number of players shown by the navbar player search
+PLAYER_SEARCH_LIMIT = int(os.environ.get("PLAYER_SEARCH_LIMIT", 10))
+
+# rendered team page layouts kept per team, current season, and cache version
+LAYOUT_CACHE_MAX_ENTRIES = int(os.environ.get("LAYOUT_CACHE_MAX_ENTRIES", 64))
+LAYOUT_CACHE_TTL = float(os.environ.get("LAYOUT_CACHE_TTL", 300))
+
+# seconds a page layout waits on all of its data before giving up
+PAGE_LOAD_DEADLINE = float(os.environ.get("PAGE_LOAD_DEADLINE", 10))
+# seconds to wait on a remote logo or headshot before letting the browser load it directly
+IMAGE_LOAD_TIMEOUT = float(os.environ.get("IMAGE_LOAD_TIMEOUT", 3))
+
+# local copies of logos and headshots stored by content hash and served from IMAGE_CACHE_ROUTE
+# IMAGE_CACHE_TTL is how long a remote url keeps pointing to its downloaded copy before being checked again
+# files in IMAGE_CACHE_DIR are served from the app's origin so it must live in a directory only the app user can write to
+IMAGE_CACHE_DIR = os.environ.get("IMAGE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "hockey-stats", "images"))
+IMAGE_CACHE_ROUTE = "/images"
+IMAGE_CACHE_TTL = float(os.environ.get("IMAGE_CACHE_TTL", 86400))
+IMAGE_CACHE_MAX_AGE = int(os.environ.get("IMAGE_CACHE_MAX_AGE", 31536000))
+# widths thumbnails can be requested at, needs Pillow installed
+IMAGE_THUMBNAIL_WIDTHS = (100, 300)
+
 DIVISION_TEAMS = {
     "Pacific": [
         "Anaheim Ducks",
@@ -107,6 +157,18 @@ TEAM_BY_ABBR = {
     "WSH": "Washington Capitals",
 }
 
+# bit assigned to each player position
+# players with multiple positions have the bits of each position combined
+POSITION_BITS = {
+    "C": 1,
+    "RW": 2,
+    "LW": 4,
+    "RD": 8,
+    "LD": 16,
+    "D": 32,
+    "G": 64,
+}
+
 # tuple of rgba values of colors to use for specific teams
 TEAM_COLORS = {
     'Anaheim Ducks': {
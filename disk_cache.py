@@ -0,0 +1,247 @@
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def is_private_stat(stat):
+    """
+    Return whether a file or directory is owned by this user and can't be written by anyone else.
+
+    Args:
+        stat (os.stat_result): Status of the file or directory.
+
+    Returns:
+        bool: True if only this user can write to it.
+    """
+    uid = os.getuid() if hasattr(os, "getuid") else None
+    return (uid is None or stat.st_uid == uid) and not stat.st_mode & 0o022
+
+
+def make_private_directory(directory:str):
+    """
+    Create a directory with owner-only permissions if it doesn't exist, then check no other user can write to it.
+    Shared locations such as /tmp let other users plant or replace files before the app creates them.
+
+    Args:
+        directory (str): Path of the directory.
+
+    Returns:
+        bool: True if the directory is safe to store cached files in.
+    """
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        directory_stat = os.stat(directory)
+    except OSError as e:
+        logger.warning("Can't create cache directory %s: %s", directory, e)
+        return False
+
+    if not is_private_stat(directory_stat):
+        logger.warning("Cache directory %s is writable by other users", directory)
+        return False
+
+    return True
+
+
+class DiskCache:
+    """
+    Cache stored in a local SQLite file so every gunicorn worker shares the same entries and they survive restarts.
+    Values are pickled. Every entry is tagged with the cache version and generation it was written under,
+    so bumping either one invalidates every existing entry at once.
+
+    Args:
+        path (str): Path of the SQLite file. An empty path disables the cache.
+            The cache is also disabled if the file or its directory could have been written by another user.
+        version (str): Version tag of the stored data. Entries written under another version are ignored.
+        prune_every (int): Number of writes between removing expired and outdated entries.
+    """
+    def __init__(self, path:str, version="1", prune_every=100):
+        self.path = path
+        self.version = str(version)
+        self.prune_every = prune_every
+        self.enabled = bool(path) and self._is_private_path()
+        self._local = threading.local()
+        self._writes = 0
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def _is_private_path(self):
+        """
+        Create the cache file with owner-only permissions if it doesn't exist,
+        then check the file and its directory are owned by this user and can't be written by anyone else.
+        Values are unpickled from the file, so a file another user could write to would let them run code in the app.
+
+        Returns:
+            bool: True if the cache file is safe to use.
+        """
+        if not make_private_directory(os.path.dirname(os.path.abspath(self.path))):
+            logger.warning("Disk cache disabled, the directory of %s isn't private", self.path)
+            return False
+
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0), 0o600)
+            try:
+                file_stat = os.fstat(fd)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logger.warning("Disk cache disabled, can't open %s: %s", self.path, e)
+            return False
+
+        if not is_private_stat(file_stat):
+            logger.warning("Disk cache disabled, %s is writable by other users", self.path)
+            return False
+
+        return True
+
+    def _connect(self):
+        """
+        Return a SQLite connection for the current thread, creating the tables on first use.
+
+        Returns:
+            sqlite3.Connection: Connection to the cache file.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and getattr(self._local, "pid", None) == os.getpid():
+            return conn
+
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+
+        with self._init_lock:
+            if not self._initialized:
+                conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+                conn.execute("INSERT OR IGNORE INTO meta (name, value) VALUES ('generation', 0)")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    "key TEXT PRIMARY KEY, version TEXT NOT NULL, expires REAL, value BLOB NOT NULL)"
+                )
+                self._initialized = True
+
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _current_version(self, conn):
+        generation = conn.execute("SELECT value FROM meta WHERE name = 'generation'").fetchone()[0]
+        return f"{self.version}.{generation}"
+
+    def get_version(self):
+        """
+        Return the version and generation entries are currently written under.
+        Changes whenever the cache is invalidated, so it can be used to version data derived from cached entries.
+
+        Returns:
+            str: Current version of the cache.
+        """
+        if not self.enabled:
+            return self.version
+
+        try:
+            return self._current_version(self._connect())
+        except sqlite3.Error:
+            return self.version
+
+    def get(self, key:str, default=None):
+        """
+        Return the cached value for 'key' or 'default' if missing, expired, or from an old version.
+
+        Args:
+            key (str): Cache key.
+            default (any): Value to return on a cache miss.
+
+        Returns:
+            any: Cached value or default.
+        """
+        return self.get_with_ttl(key, default)[0]
+
+    def get_with_ttl(self, key:str, default=None):
+        """
+        Return the cached value for 'key' along with the seconds it has left before expiring.
+
+        Args:
+            key (str): Cache key.
+            default (any): Value to return on a cache miss.
+
+        Returns:
+            tuple: Cached value or default, seconds left or None if the entry never expires.
+        """
+        if not self.enabled:
+            return default, None
+
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT version, expires, value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return default, None
+
+            version, expires, value = row
+            ttl = None if expires is None else expires - time.time()
+            if version != self._current_version(conn) or (ttl is not None and ttl <= 0):
+                return default, None
+
+            return pickle.loads(value), ttl
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return default, None
+
+    def set(self, key:str, value, ttl=None):
+        """
+        Store 'value' under 'key' for the current version.
+
+        Args:
+            key (str): Cache key.
+            value (any): Picklable value to store.
+            ttl (float): Seconds to keep the entry. None never expires.
+        """
+        if not self.enabled:
+            return
+
+        expires = None if ttl is None else time.time() + ttl
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, version, expires, value) VALUES (?, ?, ?, ?)",
+                (key, self._current_version(conn), expires, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)),
+            )
+        except (sqlite3.Error, pickle.PicklingError):
+            return
+
+        self._writes += 1
+        if self._writes % self.prune_every == 0:
+            self.prune()
+
+    def invalidate(self):
+        """
+        Invalidate every entry for all workers by bumping the cache generation.
+        """
+        if not self.enabled:
+            return
+
+        try:
+            conn = self._connect()
+            conn.execute("UPDATE meta SET value = value + 1 WHERE name = 'generation'")
+        except sqlite3.Error:
+            pass
+
+    def prune(self):
+        """
+        Remove expired entries and entries from old versions.
+        """
+        if not self.enabled:
+            return
+
+        try:
+            conn = self._connect()
+            conn.execute(
+                "DELETE FROM entries WHERE version != ? OR (expires IS NOT NULL AND expires <= ?)",
+                (self._current_version(conn), time.time()),
+            )
+        except sqlite3.Error:
+            pass
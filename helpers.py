@@ -1,8 +1,12 @@
 import dash_ag_grid as dag
-import numpy as np
+from dash import dcc
+import pandas as pd
+import os
 import re
 import unicodedata
 
+from types import MappingProxyType
+
 from data_values import TEAM_COLORS
 
 # helper dict to rename data from database to a more readable column header
@@ -77,10 +81,41 @@ rename_data_df_cols = {
 }
 
 
+# stats stored as fractions by the database that are displayed as percents
+percent_stat_cols = ["FO %", "Save %", "PP %", "PK %", "Shot %"]
+
+# number of decimals displayed for float stats
+# team and player profile data is scaled to percents
+team_stat_decimals = {
+    "G/G": 2,
+    "GA/G": 2,
+    "FO %": 2,
+    "PP %": 2,
+    "PK %": 2,
+    "Save %": 2,
+    "Shot %": 2,
+    "Shots/G": 2,
+    "Shots Against/G": 2,
+}
+# season player data keeps save % as a fraction
+player_stat_decimals = {
+    "FO %": 2,
+    "Save %": 3,
+    "GAA": 2,
+}
+
+
 def get_stat_sorting(stat):    
     ascending_stats = {
         "GA": True,
         "GAA": True,
+        "GA/G": True,
+        "PP GA": True,
+        "SH GA": True,
+        "Shots Against": True,
+        "Shots Against/G": True,
+        "PP Shots Against": True,
+        "SH Shots Against": True,
     }
     
     try:
@@ -96,19 +131,12 @@ def get_colors(team_name:str, color="primary"):
  
     Args:
         team_name (str): Team name to get color values for.
-        color (str): Specific color to obtain. Ex: 'primary', 'secondary', 'primary_text', etc.
+        color (str): Specific color to obtain. Any key of TEAM_PALETTES e.g. 'primary', 'secondary_soft', 'primary_complement'.
  
     Returns:
         str: String of css rgba color.
     """
-    colors = {
-        "primary": f"rgba{TEAM_COLORS[team_name]['primary']}",
-        "primary_text": f"rgba{TEAM_COLORS[team_name]['primary_text']}",
-        "secondary": f"rgba{TEAM_COLORS[team_name]['secondary']}",
-        "secondary_text": f"rgba{TEAM_COLORS[team_name]['secondary_text']}",
-    }
-    
-    return colors.get(color, "primary")
+    return TEAM_PALETTES[team_name].get(color, "primary")
 
 
 def get_triadics_from_rgba(rgba:tuple):
@@ -123,8 +151,10 @@ def get_triadics_from_rgba(rgba:tuple):
     Returns:
         tuple[str]: Strings of css rgba colors for (triadic 1, triadic 2).
     """
-    first = tuple(np.append(np.roll(rgba[:-1], 1), rgba[-1]))
-    second = tuple(np.append(np.roll(first[:-1], 1), first[-1]))
+    # rotate the rgb values one place, alpha is unchanged
+    r, g, b, a = rgba
+    first = (b, r, g, a)
+    second = (g, b, r, a)
     
     return f"rgba{first}", f"rgba{second}"
 
@@ -182,6 +212,85 @@ def reverse_slugify(slug:str):
     return slug.replace("-", " ").title()
 
 
+def build_team_palette(colors:dict):
+    """
+    Return every css rgba color used to theme a team from its base colors.
+ 
+    Args:
+        colors (dict): 'primary', 'primary_text', 'secondary', and 'secondary_text' rgba tuples of a team.
+ 
+    Returns:
+        MappingProxyType: Read-only mapping of color name to css rgba string.
+    """
+    primary = colors["primary"]
+    secondary = colors["secondary"]
+    triadic_one, triadic_two = get_triadics_from_rgba(primary)
+    
+    return MappingProxyType({
+        "primary": f"rgba{primary}",
+        "primary_text": f"rgba{colors['primary_text']}",
+        "secondary": f"rgba{secondary}",
+        "secondary_text": f"rgba{colors['secondary_text']}",
+        "primary_soft": f"rgba{primary[:-1] + (0.5, )}",
+        "secondary_soft": f"rgba{secondary[:-1] + (0.5, )}",
+        "secondary_softer": f"rgba{secondary[:-1] + (0.9, )}",
+        "primary_triadic_one": triadic_one,
+        "primary_triadic_two": triadic_two,
+        "primary_complement": get_rgba_complement(primary),
+    })
+
+
+# palettes of every team built once at import - read-only so they can be shared
+TEAM_PALETTES = MappingProxyType({team: build_team_palette(colors) for team, colors in TEAM_COLORS.items()})
+
+
+def get_team_palette_class(team_name:str):
+    """
+    Return the css class setting the team color custom properties of a team, see get_team_palette_css.
+    
+    Example: get_team_palette_class('St Louis Blues') -> 'team-palette-st-louis-blues'
+ 
+    Args:
+        team_name (str): Team name to get the class of.
+ 
+    Returns:
+        str: Css class name.
+    """
+    return f"team-palette-{slugify(team_name)}"
+
+
+def get_team_palette_css():
+    """
+    Return a stylesheet with a class for each team setting its palette as css custom properties.
+    Palette names are converted to properties e.g. 'secondary_soft' -> '--team-color-secondary-soft' and 'primary_text' -> '--team-text-color-primary'.
+ 
+    Returns:
+        str: Css of every team palette class.
+    """
+    def get_property(color:str):
+        if color.endswith("_text"):
+            return f"--team-text-color-{color[:-len('_text')]}"
+        return f"--team-color-{color.replace('_', '-')}"
+
+    rules = []
+    for team, palette in TEAM_PALETTES.items():
+        properties = "\n".join([f"    {get_property(color)}: {value};" for color, value in palette.items()])
+        rules.append(f".{get_team_palette_class(team)} {{\n{properties}\n}}\n")
+
+    return "/* generated by helpers.write_team_palette_css() from TEAM_COLORS - do not edit */\n\n" + "\n".join(rules)
+
+
+def write_team_palette_css(path=os.path.join(os.path.dirname(__file__), "assets", "team-palettes.css")):
+    """
+    Write the team palette stylesheet. Rerun after changing TEAM_COLORS.
+ 
+    Args:
+        path (str): Path of the stylesheet. Defaults to the Dash assets folder so it's served with every page.
+    """
+    with open(path, "w") as f:
+        f.write(get_team_palette_css())
+
+
 
 def cols_to_percent(df, cols):
     for col in cols:
@@ -191,6 +300,65 @@ def cols_to_percent(df, cols):
             pass
     return df
 
+
+def round_stat_cols(df, decimals:dict):
+    """
+    Round float stat columns to the given number of decimals. Columns stay numeric, missing columns are skipped.
+ 
+    Args:
+        df (obj): dataFrame to round.
+        decimals (dict): Column name to number of decimals.
+ 
+    Returns:
+        obj: The rounded dataFrame.
+    """
+    return df.round({col: places for col, places in decimals.items() if col in df.columns})
+
+
+def create_formatted_df(response, index=None, sort_by=None, ascending=False, percent_cols=percent_stat_cols, decimals=team_stat_decimals):
+    """
+    Formats json data returned from the backend database into a dataFrame.
+    Renames columns to readable headers, scales percent columns, and rounds float stats.
+    Values stay numeric - grids display them with the same decimals through get_agGrid_columnDefs.
+ 
+    Args:
+        response (list): json response of data.
+        index (str): Optional column to use as the index.
+        sort_by (str): Optional column to sort by.
+        ascending (bool): Sort order used with sort_by.
+        percent_cols (list[str]): Columns to scale from fractions to percents.
+        decimals (dict): Column name to number of decimals to round to.
+ 
+    Returns:
+        obj: Formatted dataFrame of database data.
+    """
+    df = pd.json_normalize(response)
+    
+    if index is not None:
+        df = df.set_index(index)
+
+    df = df.rename(columns=rename_data_df_cols)
+    if sort_by is not None:
+        df = df.sort_values(sort_by, ascending=ascending)
+    
+    if percent_cols:
+        df = cols_to_percent(df, percent_cols)
+    
+    return round_stat_cols(df, decimals)
+
+
+def get_decimal_formatter(places:int):
+    """
+    Return an AG Grid valueFormatter that displays numbers with a fixed number of decimals.
+ 
+    Args:
+        places (int): Number of decimals to display.
+ 
+    Returns:
+        dict: valueFormatter columnDef value.
+    """
+    return {"function": f"params.value == null ? '' : d3.format('.{places}f')(params.value)"}
+
 def add_default_text_columnDef(field:str, **kwargs):
     """
     Add a filterable columnDef field for text data to an existing AG Grid columnDef list.
@@ -238,12 +406,14 @@ def add_default_number_columnDef(field:str, center=True, **kwargs):
     return columnDef
     
 
-def get_agGrid_columnDefs(grid_type:str, add_link=True):
+def get_agGrid_columnDefs(grid_type:str, add_link=True, decimals=None):
     """
     Return a list of all columnDef fields to add to existing dag.AgGrid.
  
     Args:
         grid_type (str): Type of grid data to create.
+        add_link (bool): If true, will pin a player name link column to the left of the grid.
+        decimals (dict): Optional column name to number of decimals to display.
  
     Returns:
         List of dicts of all columnDef field parameters.
@@ -255,7 +425,8 @@ def get_agGrid_columnDefs(grid_type:str, add_link=True):
         add_default_number_columnDef("GP", headerTooltip="Games Played"),
     ]
     if add_link:
-        base_defs .insert(0, add_default_text_columnDef("PlayerLink", pinned="left", lockPinned=True, cellRenderer="markdown", headerName="Name"))
+        # link is rendered by the browser from the row's Name and Player id - see assets/dashAgGridComponentFunctions.js
+        base_defs .insert(0, add_default_text_columnDef("Name", pinned="left", lockPinned=True, cellRenderer="PlayerLink"))
     if grid_type == "Team":
         column_defs = [
             add_default_number_columnDef("Year", pinned="left", lockPinned=True),
@@ -322,19 +493,64 @@ def get_agGrid_columnDefs(grid_type:str, add_link=True):
             add_default_number_columnDef("P", headerTooltip="Points}"),
         ]
         column_defs = base_defs + goalie_defs
+    
+    if decimals:
+        for column_def in column_defs:
+            if column_def["field"] in decimals:
+                column_def["valueFormatter"] = get_decimal_formatter(decimals[column_def["field"]])
         
     return column_defs
 
 
-def get_agGrid_layout(df:object, grid_type:str, grid_id:str, add_link=True, **kwargs):
+def df_to_columnar(df:object, **kwargs):
+    """
+    Return a compact columnar json payload of a dataFrame for AG Grid.
+    Column names are only sent once instead of once per row. Rebuilt into rows in the browser by the
+    'columnar' clientside functions in assets/dashColumnarRows.js.
+ 
+    Args:
+        df (obj): dataFrame to convert.
+        **kwargs (any): Extra values to add to the payload e.g. 'rowCount'.
+ 
+    Returns:
+        dict: {'columns': list of column names, 'data': list of column value lists}.
+    """
+    payload = {
+        "columns": list(df.columns),
+        "data": [df[col].tolist() for col in df.columns],
+    }
+    payload.update(kwargs)
+    return payload
+
+
+def get_columnar_store(df:object, grid_id:str):
+    """
+    Return a dcc.Store of columnar row data for a grid created with get_agGrid_layout(columnar=True).
+    The page must register a clientside callback from the store to the grid rowData using the 'columnar.toRowData' function.
+ 
+    Args:
+        df (obj): dataFrame of grid data.
+        grid_id (str): Id of grid component. The store id is '{grid_id}-columnar'.
+ 
+    Returns:
+        obj: dcc.Store.
+    """
+    return dcc.Store(data=df_to_columnar(df), id=f"{grid_id}-columnar")
+
+
+def get_agGrid_layout(df:object, grid_type:str, grid_id:str, add_link=True, decimals=None, infinite=False, columnar=False, **kwargs):
     """
     Return stylized ag Grid of filtered data.
     Will default to use ag-theme-alpine theme. Can optionally provide a className kwarg that corresponds to a custom css class.
  
     Args:
-        df (obj): dataFrame of filtered data.
+        df (obj): dataFrame of filtered data. Not used by infinite grids.
         grid_type (str): Group used to select displayed columns.
         grid_id (str): Id of grid component.
+        add_link (bool): If true, will pin a player name link column to the left of the grid.
+        decimals (dict): Optional column name to number of decimals to display.
+        infinite (bool): If true, the grid uses the infinite row model and requests blocks of rows through its getRowsRequest prop.
+        columnar (bool): If true, rowData is left empty to be filled from a get_columnar_store store.
  
     Returns:
         obj: ag Grid.
@@ -343,13 +559,109 @@ def get_agGrid_layout(df:object, grid_type:str, grid_id:str, add_link=True, **kw
         className = kwargs.pop("className")
     except KeyError:
         className = "ag-theme-alpine base-grid"
+    
+    if infinite:
+        kwargs["rowModelType"] = "infinite"
+    elif not columnar:
+        kwargs["rowData"] = df.to_dict("records")
         
     return dag.AgGrid(
-            rowData=df.to_dict("records"),
-            columnDefs=get_agGrid_columnDefs(grid_type, add_link),
+            columnDefs=get_agGrid_columnDefs(grid_type, add_link, decimals),
             id=grid_id,
             className=className,
             columnSize="autoSize",
             defaultColDef = {"headerClass": 'center-aligned-header'},
             **kwargs,
-        )
\ No newline at end of file
+        )
+
+
+def get_agGrid_filter_mask(series:object, condition:dict):
+    """
+    Return a boolean mask of the rows of 'series' matching a single AG Grid filter condition.
+ 
+    Args:
+        series (obj): Pandas Series of the filtered column.
+        condition (dict): AG Grid filter condition e.g. {'filterType': 'number', 'type': 'greaterThan', 'filter': 5}.
+ 
+    Returns:
+        obj: Boolean Pandas Series.
+    """
+    filter_type = condition.get("type")
+    blank = series.isna() | (series.astype(str) == "")
+    if filter_type == "blank":
+        return blank
+    if filter_type == "notBlank":
+        return ~blank
+    
+    if condition.get("filterType") == "number":
+        values = pd.to_numeric(series, errors="coerce")
+        value = condition.get("filter")
+        if value is None:
+            return pd.Series(True, index=series.index)
+        
+        number_filters = {
+            "equals": lambda: values == value,
+            "notEqual": lambda: values != value,
+            "lessThan": lambda: values < value,
+            "lessThanOrEqual": lambda: values <= value,
+            "greaterThan": lambda: values > value,
+            "greaterThanOrEqual": lambda: values >= value,
+            "inRange": lambda: (values > value) & (values < condition.get("filterTo")),
+        }
+        return number_filters.get(filter_type, lambda: pd.Series(True, index=series.index))()
+    
+    values = series.fillna("").astype(str).str.lower()
+    value = str(condition.get("filter") or "").lower()
+    text_filters = {
+        "contains": lambda: values.str.contains(value, regex=False),
+        "notContains": lambda: ~values.str.contains(value, regex=False),
+        "equals": lambda: values == value,
+        "notEqual": lambda: values != value,
+        "startsWith": lambda: values.str.startswith(value),
+        "endsWith": lambda: values.str.endswith(value),
+    }
+    return text_filters.get(filter_type, lambda: pd.Series(True, index=series.index))()
+
+
+def get_agGrid_row_positions(df:object, filter_model:dict, sort_model:list, mask=None):
+    """
+    Return the positions of the rows of a dataFrame matching an AG Grid filterModel, in sortModel order.
+    Only the sorted columns of the matching rows are copied. Unknown columns are ignored.
+ 
+    Args:
+        df (obj): dataFrame to filter and sort.
+        filter_model (dict): AG Grid filterModel of column name to filter conditions.
+        sort_model (list): AG Grid sortModel e.g. [{'colId': 'P', 'sort': 'desc'}].
+        mask (obj): Optional boolean array of rows to start from.
+ 
+    Returns:
+        obj: numpy array of row positions, use with df.iloc.
+    """
+    mask = pd.Series(True if mask is None else mask, index=df.index)
+    for col, model in (filter_model or {}).items():
+        if col not in df.columns:
+            continue
+        
+        # combined conditions are given as a list of 'conditions' with an 'operator'
+        conditions = model.get("conditions") or [model]
+        col_masks = [get_agGrid_filter_mask(df[col], condition) for condition in conditions]
+        col_mask = col_masks[0]
+        for condition_mask in col_masks[1:]:
+            col_mask = col_mask | condition_mask if model.get("operator") == "OR" else col_mask & condition_mask
+        
+        mask &= col_mask
+    
+    positions = mask.to_numpy().nonzero()[0]
+    sort_model = [i for i in sort_model or [] if i["colId"] in df.columns]
+    if not sort_model:
+        return positions
+    
+    sort_cols = [i["colId"] for i in sort_model]
+    order = df[sort_cols].iloc[positions].reset_index(drop=True).sort_values(
+        sort_cols,
+        ascending=[i["sort"] == "asc" for i in sort_model],
+        kind="stable",
+        na_position="last",
+    ).index.to_numpy()
+    
+    return positions[order]
@@ -0,0 +1,205 @@
+import asyncio
+import hashlib
+import mimetypes
+import os
+import tempfile
+
+from flask import abort, request, send_file
+from urllib.parse import urlsplit
+from werkzeug.security import safe_join
+
+from backend_client import fetch_bytes, disk_cache
+from disk_cache import make_private_directory
+from cache import TTLCache
+from data_values import IMAGE_CACHE_DIR, IMAGE_CACHE_ROUTE, IMAGE_CACHE_TTL, IMAGE_CACHE_MAX_AGE, IMAGE_THUMBNAIL_WIDTHS
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# remote image url -> file name of its local copy
+image_names = TTLCache(max_entries=1024, default_ttl=IMAGE_CACHE_TTL)
+# images are only stored and served if no other user can write to the cache directory
+image_cache_enabled = make_private_directory(IMAGE_CACHE_DIR)
+
+
+def is_image_content_type(content_type:str):
+    """
+    Return whether a Content-Type header is an image type.
+
+    Args:
+        content_type (str): Content-Type header of a response.
+
+    Returns:
+        bool: True for image/* types.
+    """
+    return (content_type or "").split(";")[0].strip().lower().startswith("image/")
+
+
+def get_image_extension(url:str, content_type:str):
+    """
+    Return the file extension of an image from its Content-Type, falling back to the extension of the url.
+
+    Args:
+        url (str): Remote image url.
+        content_type (str): Content-Type header of the image response.
+
+    Returns:
+        str: File extension including the leading dot.
+    """
+    extension = mimetypes.guess_extension((content_type or "").split(";")[0].strip())
+    return extension or os.path.splitext(urlsplit(url).path)[1] or ".img"
+
+
+def write_file(path:str, write):
+    """
+    Write a file in the cache directory through a uniquely named temp file, then move it into place
+    so other workers never serve a partial file.
+
+    Args:
+        path (str): Final path of the file.
+        write (callable): Function writing the file contents to the temp file path passed to it.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=IMAGE_CACHE_DIR, suffix=f".tmp{os.path.splitext(path)[1]}")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def write_image(name:str, content:bytes):
+    """
+    Write an image to the cache directory. Files are named by content hash so existing files are never rewritten.
+
+    Args:
+        name (str): File name of the image.
+        content (bytes): Image data.
+    """
+    path = os.path.join(IMAGE_CACHE_DIR, name)
+    if os.path.exists(path):
+        return
+
+    def write(tmp_path):
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+
+    write_file(path, write)
+
+
+def get_image_src(name:str, width=None):
+    """
+    Return the local url of a cached image.
+
+    Args:
+        name (str): File name of the image.
+        width (int): Optional thumbnail width, one of IMAGE_THUMBNAIL_WIDTHS.
+
+    Returns:
+        str: Url of the image served by serve_image.
+    """
+    src = f"{IMAGE_CACHE_ROUTE}/{name}"
+    return f"{src}?w={width}" if width else src
+
+
+async def cache_image(url:str, width=None):
+    """
+    Download a remote image once, store it under its content hash, and return its local url.
+    The url to file mapping is shared between workers through the disk cache.
+    Responses that aren't images are never stored, the browser loads the remote url instead.
+
+    Args:
+        url (str): Remote image url.
+        width (int): Optional thumbnail width, one of IMAGE_THUMBNAIL_WIDTHS.
+
+    Returns:
+        str: Url of the local copy of the image, or the remote url if it can't be cached.
+    """
+    if not image_cache_enabled:
+        return url
+
+    loop = asyncio.get_running_loop()
+    name = image_names.get(url)
+    if name is None:
+        name = await loop.run_in_executor(None, disk_cache.get, f"image:{url}")
+
+    if name is None or not os.path.exists(os.path.join(IMAGE_CACHE_DIR, name)):
+        content_type, content = await fetch_bytes(url)
+        if not is_image_content_type(content_type):
+            return url
+        name = hashlib.sha256(content).hexdigest()[:32] + get_image_extension(url, content_type)
+        await loop.run_in_executor(None, write_image, name, content)
+        await loop.run_in_executor(None, disk_cache.set, f"image:{url}", name, IMAGE_CACHE_TTL)
+
+    image_names.set(url, name)
+    return get_image_src(name, width)
+
+
+def get_thumbnail_path(path:str, width:int):
+    """
+    Return the path of a resized copy of an image, creating it on first use.
+    Falls back to the original image if Pillow isn't installed or can't read the image e.g. svg logos.
+
+    Args:
+        path (str): Path of the original image.
+        width (int): Thumbnail width. Height keeps the image aspect ratio.
+
+    Returns:
+        str: Path of the thumbnail or original image.
+    """
+    if Image is None:
+        return path
+
+    stem, extension = os.path.splitext(path)
+    thumbnail_path = f"{stem}_w{width}{extension}"
+    if os.path.exists(thumbnail_path):
+        return thumbnail_path
+
+    try:
+        with Image.open(path) as image:
+            image.thumbnail((width, image.height))
+            write_file(thumbnail_path, lambda tmp_path: image.save(tmp_path, format=image.format))
+    except (OSError, ValueError):
+        return path
+
+    return thumbnail_path
+
+
+def serve_image(name:str):
+    """
+    Flask view serving a cached image with long-lived cache headers.
+    File names are content hashes, so the name is used as the ETag and the response never changes.
+
+    Args:
+        name (str): File name of the image.
+
+    Returns:
+        flask.Response: The image or a 304 response if the browser copy is current.
+    """
+    path = safe_join(IMAGE_CACHE_DIR, name)
+    if not image_cache_enabled or path is None or not os.path.isfile(path):
+        abort(404)
+
+    width = request.args.get("w", type=int)
+    etag = name
+    if width in IMAGE_THUMBNAIL_WIDTHS:
+        path = get_thumbnail_path(path, width)
+        etag = f"{name}-w{width}"
+
+    response = send_file(path, max_age=IMAGE_CACHE_MAX_AGE, etag=etag, conditional=True)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+def register_image_routes(server):
+    """
+    Register the cached image route on the Flask server of the app.
+
+    Args:
+        server (flask.Flask): Flask server of the Dash app.
+    """
+    server.add_url_rule(f"{IMAGE_CACHE_ROUTE}/<name>", "serve_image", serve_image)
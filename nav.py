@@ -3,43 +3,9 @@ import dash_bootstrap_components as dbc
 from dash import html
 
 from helpers import slugify
-import aiohttp
-import asyncio
 
-from data_values import DIVISION_TEAMS, BACKEND_URL, ROOT_URL
-
-
-async def query_all_player_names():
-    """
-    Performs an async query to the backed server to get all player names.
-
-    Returns:
-        json response of data.
-    """
-    async with aiohttp.ClientSession() as session:
-        api_url = f"{BACKEND_URL}/api/players/all_names"
-        async with session.get(api_url) as resp:
-            data = await resp.json()
-
-    return data
-
-
-def get_player_names():
-    """
-    Queries backend database for data then returns list of player names.
-
-    Returns:
-        list: List of all player names in json format.
-    """
-    return asyncio.run(query_all_player_names())
-
-def get_options_from_names():
-    return [
-        {
-            "label": player["name"],
-            "value": player["id"],
-        } for player in get_player_names()
-    ]
+from player_search import search_players
+from data_values import DIVISION_TEAMS, ROOT_URL
 
 
 def build_team_col(division, division_teams):
@@ -88,7 +54,7 @@ nav = dbc.NavbarSimple(
         # dbc.NavItem(dbc.NavLink("League", href="/league")),
         dcc.Dropdown(
             placeholder="Search Players...",
-            options=get_options_from_names(),
+            options=[],
             style={"width": 200, "backgroundColor": "black", "borderColor": "darkgrey", "marginTop": "0.5%"},
             className="player-search",
             id="player-search",
@@ -115,6 +81,17 @@ def show_dropdown(value):
         return 500
     return 0
 
+# options are searched server-side so the navbar doesn't hold every player name
+# keep the current options once the search is cleared so the selected player stays displayed
+@callback(
+    Output("player-search", "options"),
+    Input("player-search", "search_value")
+)
+def update_player_options(search_value):
+    if not search_value:
+        return no_update
+    return search_players(search_value)
+
 # player dropdown links only work when clicking on the name itself
 # add additional dcc.Location routing if selecting player by pressing Enter
 # or by selecting the dropdown option row area next to the text
@@ -6,19 +6,16 @@ from helpers import slugify
 import requests
 import datetime
 from zoneinfo import ZoneInfo
-import aiohttp
-import asyncio
 
+from backend_client import fetch_json, run
 from data_values import TEAM_BY_ABBR, ROOT_URL
 
 dash.register_page(__name__, path="/", title="Hockey Stats")
 
 async def get_games():
-    async with aiohttp.ClientSession() as session:
-        pst_day = datetime.datetime.now(ZoneInfo("America/Los_Angeles"))
-        api_url = f"https://api-web.nhle.com/v1/score/{pst_day.date()}"
-        async with session.get(api_url) as resp:
-            data = await resp.json()
+    pst_day = datetime.datetime.now(ZoneInfo("America/Los_Angeles"))
+    api_url = f"https://api-web.nhle.com/v1/score/{pst_day.date()}"
+    data = await fetch_json(api_url)
 
     return data.get("games")
 
@@ -173,7 +170,7 @@ def add_game_rows(games:list):
         
 
 def layout():
-    games = asyncio.run(get_games())
+    games = run(get_games())
     
     return html.Div(
         [
@@ -198,7 +195,7 @@ def layout():
     Input("score-interval", "n_intervals")
 )
 def refresh_scores(n_intervals):
-    games = asyncio.run(get_games())
+    games = run(get_games())
     
     interval = 60 * 1000
     try:
@@ -7,6 +7,8 @@ def player_404_layout(status, player_id):
         h1_text = f"{status}: Invalid player ID entered."
     elif status == 404:
         h1_text = f"{status}: Sorry, player ID {player_id} could not be found."
+    elif status == 504:
+        h1_text = f"{status}: Sorry, player ID {player_id} took too long to load."
         
     return html.Div(
         [
@@ -1,24 +1,29 @@
 import dash
-from dash import html, dcc, callback, Input, Output, State, ctx, no_update
+from dash import html, dcc, callback, clientside_callback, ClientsideFunction, Input, Output, State, ctx, no_update
 import dash_bootstrap_components as dbc
 import dash_loading_spinners as dls
 import dash_ag_grid as dag
 
-import aiohttp
 import asyncio
 import base64
+import json
+import uuid
 import pandas as pd
 import numpy as np
 
 from helpers import slugify
 from pathlib import Path
-from io import StringIO
 
-from data_values import BACKEND_URL
-from helpers import stringify_season, rename_data_df_cols, get_stat_sorting, get_agGrid_layout, get_agGrid_columnDefs, cols_to_percent
+from backend_client import query_backend, get_cached_frame, run
+from cache import TTLCache
+from data_values import POSITION_BITS, GRID_VIEW_MAX_ENTRIES, GRID_VIEW_TTL
+from helpers import stringify_season, get_stat_sorting, get_agGrid_layout, get_agGrid_columnDefs, create_formatted_df, player_stat_decimals, get_agGrid_row_positions, df_to_columnar
 
 dash.register_page(__name__, path="/players", title="Hockey Stats | Player Stats")
 
+# (bundle version, position, sort, filter) -> row positions of the grid view
+grid_views = TTLCache(max_entries=GRID_VIEW_MAX_ENTRIES, default_ttl=GRID_VIEW_TTL)
+
 
 async def query_player_stats(endpoint:str):
     """
@@ -30,12 +35,21 @@ async def query_player_stats(endpoint:str):
     Returns:
         json response of data.
     """
-    async with aiohttp.ClientSession() as session:
-        api_url = f"{BACKEND_URL}/api/season/{endpoint}"
-        async with session.get(api_url) as resp:
-            data = await resp.json()
+    return await query_backend(f"season/{endpoint}")
 
-    return data
+
+async def query_season_metadata():
+    """
+    Concurrently queries the current season and the list of all seasons.
+ 
+    Returns:
+        tuple: current season e.g. 20232024, list of all seasons.
+    """
+    current_season, all_seasons = await asyncio.gather(
+        query_player_stats("current_season"),
+        query_player_stats("all_seasons"),
+    )
+    return current_season["season"], all_seasons["season"]
 
 
 def build_player_query_url(skater_type="skater", player_type="all", season="All Seasons", season_type="Regular Season", team="All Teams"):
@@ -78,9 +92,45 @@ def get_player_options(position:str):
     return player_options or [position]
     
 
-def filter_data_by_position(df:object, position:str):
+def get_position_mask(position:str):
+    """
+    Returns the combined position bits of every position in a position group.
+ 
+    Args:
+        position (str): The position group or a specific position e.g. 'Forwards', 'C'.
+ 
+    Returns:
+        int: Bitmask of all positions in the group.
+    """
+    mask = 0
+    for option in get_player_options(position):
+        mask |= POSITION_BITS.get(option, 0)
+    return mask
+
+
+def encode_positions(positions:object):
     """
-    Filter and return a dataframe of only the given positions.
+    Encodes each player's list of positions as a single bitmask integer using POSITION_BITS.
+ 
+    Args:
+        positions (obj): Pandas Series of position lists e.g. ['C', 'LW'].
+ 
+    Returns:
+        obj: Pandas Series of position bitmasks with the same index.
+    """
+    # explode against row numbers so a duplicate index can't mix up players
+    exploded = pd.Series(positions.to_numpy()).explode()
+    bits = exploded.map(POSITION_BITS).fillna(0).astype(np.int64)
+    
+    mask = np.zeros(len(positions), dtype=np.int64)
+    np.bitwise_or.at(mask, bits.index.to_numpy(), bits.to_numpy())
+    
+    return pd.Series(mask, index=positions.index)
+
+
+def get_position_rows_mask(df:object, position:str):
+    """
+    Return a boolean array of the rows of a dataframe playing the given positions.
  
     Args:
         df (obj): Pandas dataFrame to filter.
@@ -88,49 +138,134 @@ def filter_data_by_position(df:object, position:str):
             Or can be one of any abreviated specific position e.g. 'C', 'RD', 'G'.
  
     Returns:
-        obj: The filtered dataFrame.
+        obj: numpy boolean array.
     """
-    filter_list = get_player_options(position)
-    # find the set union where player position in contained in filter list
-    return df[df["Position"].apply(lambda x: bool(set(x) & set(filter_list)))]
+    # keep players with any position bit in common with the position group
+    return (df["PositionMask"].to_numpy() & get_position_mask(position)) != 0
 
 
-def query_to_formatted_df(query:str):
+def format_player_df(response:list):
     """
-    Queries backend database for data then formats the returned data into a dataFrame.
+    Formats the returned player data from the backend into a dataFrame.
  
     Args:
-        query (str): The url endpoint to query including query params.
+        response (list): json response of player data.
  
     Returns:
         obj: Formatted dataFrame of database data.
     """
-    df = pd.json_normalize(asyncio.run(query_player_stats(query))).set_index("id")
-    df = df.rename(columns=rename_data_df_cols)
+    df = create_formatted_df(response, index="id", percent_cols=None, decimals=player_stat_decimals)
     df["Team"] = df["Team"].fillna("N/A")
-    df["PlayerLink"] = df.apply(lambda x: f"[{x['Name']}](/player/{x['Player']})", axis=1)
-    
-    df = cols_to_percent(df, "FO %")
-    
-    rounding = {
-        "FO %": 2,
-        "Save %": 3,
-        "GAA": 2,
-    }
-    # df = df.round(rounding)
-    
-    # display issues with rounded floating imprecision
-    # convert to string to truncate
-    # if used in agGrid - grid can convert back to number with proper precision
-    for i in rounding:
-        try:
-            df[i] = df[i].apply(lambda x: f"{x:.{rounding[i]}f}")
-        except (KeyError, TypeError):
-            pass
+    df["PositionMask"] = encode_positions(df["Position"])
 
     return df
     
 
+async def query_players_bundle(season, season_type:str, team:str):
+    """
+    Concurrently queries skater and goalie data for the given filters.
+ 
+    Args:
+        season (int | str): The full season e.g. 20232024 or 'All Seasons'.
+        season_type (str): The season type to query. One of 'Pre-Season', 'Regular Season', or 'Playoffs'.
+        team (str): A specific team to query or 'All Teams'.
+ 
+    Returns:
+        tuple: json response of skater data, json response of goalie data.
+    """
+    return await asyncio.gather(
+        query_player_stats(get_players_query(season, season_type, team, "skater")),
+        query_player_stats(get_players_query(season, season_type, team, "goalie")),
+    )
+
+
+def get_players_bundle(season, season_type:str, team:str):
+    """
+    Returns formatted skater and goalie data for the given filters, fetched together and cached as one bundle.
+    Skaters are sorted by points and goalies by wins.
+    Bundles are shared between workers through the disk cache.
+    The leaders index of each dataFrame is built with the bundle so the leader boards always match the grid.
+    Each build gets a new 'version' so data derived from a bundle can tell when it has been refreshed.
+ 
+    Args:
+        season (int | str): The full season e.g. 20232024 or 'All Seasons'.
+        season_type (str): The season type to query. One of 'Pre-Season', 'Regular Season', or 'Playoffs'.
+        team (str): A specific team to query or 'All Teams'.
+ 
+    Returns:
+        dict: 'skater' and 'goalie' dataFrames, their 'leaders' indexes, and the bundle 'version'.
+    """
+    def build_bundle():
+        skaters, goalies = run(query_players_bundle(season, season_type, team))
+        skater_df = format_player_df(skaters).sort_values("P", ascending=False)
+        goalie_df = format_player_df(goalies).sort_values("W", ascending=False)
+        return {
+            "skater": skater_df,
+            "goalie": goalie_df,
+            "leaders": {"skater": build_leaders_index(skater_df), "goalie": build_leaders_index(goalie_df)},
+            "version": uuid.uuid4().hex,
+        }
+    
+    return get_cached_frame(f"season/{get_players_query(season, season_type, team, 'skater')}", build_bundle, prefix="bundle")
+
+
+def get_players_query(season, season_type:str, team:str, skater_type:str):
+    """
+    Returns the query url of the unfiltered player data for the given filters.
+ 
+    Args:
+        season (int | str): The full season e.g. 20232024 or 'All Seasons'.
+        season_type (str): The season type to query. One of 'Pre-Season', 'Regular Season', or 'Playoffs'.
+        team (str): A specific team to query or 'All Teams'.
+        skater_type (str): Either 'skater' or 'goalie'.
+ 
+    Returns:
+        str: The compiled endpoint url string.
+    """
+    return build_player_query_url(skater_type=skater_type, season=season, season_type=season_type, team=team)
+
+
+def get_skater_type(position:str):
+    """
+    Returns the type of player data to query for a position. Goalies are queried separately from skaters.
+ 
+    Args:
+        position (str): A specific position e.g. 'C' or 'All Positions'.
+ 
+    Returns:
+        str: Either 'skater' or 'goalie'.
+    """
+    return "goalie" if position == "G" else "skater"
+
+
+def get_position_filter(position:str, position_group:str):
+    """
+    Returns the position or position group used to filter player data.
+ 
+    Args:
+        position (str): A specific position e.g. 'C' or 'All Positions'.
+        position_group (str): The position group. One of 'All Skaters', 'Forwards', 'Defense', 'Goalies'.
+ 
+    Returns:
+        str: The specific position if one is selected, otherwise the position group.
+    """
+    return position_group if position == "All Positions" else position
+
+
+def store_players_bundle(filters:dict):
+    """
+    Returns the small reference to the player data bundle kept in the season-stats-df dcc.Store.
+    The bundle itself stays in the server caches and every view loads the current bundle again from its filters.
+ 
+    Args:
+        filters (dict): Keyword arguments of get_players_bundle used to build the bundle.
+ 
+    Returns:
+        dict: Filters of the bundle.
+    """
+    return {"filters": filters}
+
+
 def get_all_teams(df:object, add_all=True):
     """
     Returns a list of all teams within a given dataFrame.
@@ -150,6 +285,21 @@ def get_all_teams(df:object, add_all=True):
     return teams_list
 
 
+def get_bundle_teams(bundle:dict, add_all=True):
+    """
+    Returns a list of all teams of both the skater and goalie data of a bundle.
+ 
+    Args:
+        bundle (dict): Bundle returned by get_players_bundle.
+        add_all (bool): If true, will insert an 'All Teams' option and the beginning of the list.
+ 
+    Returns:
+        list[str]: List of all present team names.
+    """
+    teams = pd.concat([bundle["skater"][["Team"]], bundle["goalie"][["Team"]]])
+    return get_all_teams(teams[teams["Team"] != "N/A"], add_all)
+
+
 def get_leaders_dropdown_options(position="All Skaters"):
     """
     Returns a list of stat name options for filtering the dataset and returning the top 10 leaders.
@@ -165,7 +315,6 @@ def get_leaders_dropdown_options(position="All Skaters"):
         "id",
         "Player",
         "Name",
-        "PlayerLink",
         "Season",
         "Year",
         "Full Season",
@@ -289,7 +438,7 @@ def get_player_position_options_layout():
     )
 
 
-def get_league_leaders_layout(df:object, stats_list:list[str]):
+def get_league_leaders_layout(filters:dict, stats_list:list[str]):
     """
     Return nested Div of dropdown and row data of top 10 players for chosen filtered df.
     DOM tree of: 
@@ -309,7 +458,7 @@ def get_league_leaders_layout(df:object, stats_list:list[str]):
     )
  
     Args:
-        df (obj): dataFrame of filtered data to collect top 10 of selected stat.
+        filters (dict): Filters of the displayed data used to look up the top 10 of selected stat.
         stats_list (list[str]): The list of 3 stats to display for league leaders.
  
     Returns:
@@ -317,16 +466,16 @@ def get_league_leaders_layout(df:object, stats_list:list[str]):
     """
     layouts = html.Div(
         [
-            get_leaders_layout(df, stats_list[0], dropdown_id=1),
-            get_leaders_layout(df, stats_list[1], dropdown_id=2),
-            get_leaders_layout(df, stats_list[2], dropdown_id=3),
+            get_leaders_layout(filters, stats_list[0], dropdown_id=1),
+            get_leaders_layout(filters, stats_list[1], dropdown_id=2),
+            get_leaders_layout(filters, stats_list[2], dropdown_id=3),
         ],
         style={"display": "flex", "justifyContent": "space-around", "minHeight": 350},
     )
     return layouts
 
 
-def get_leaders_layout(df:object, stat:str, dropdown_id:int | str):
+def get_leaders_layout(filters:dict, stat:str, dropdown_id:int | str):
     """
     Return nested Div of dropdown and row data of top 10 players for chosen filtered df.
     DOM tree of: 
@@ -346,14 +495,14 @@ def get_leaders_layout(df:object, stat:str, dropdown_id:int | str):
     )
  
     Args:
-        df (obj): dataFrame of filtered data to collect top 10 of selected stat.
+        filters (dict): Filters of the displayed data used to look up the top 10 of selected stat.
         stat (str): dataFrame stat to display leaders for.
         dropdown_id (int | str): Used to set the id property of the dcc.Dropdown used for callbacks.
  
     Returns:
         obj: html.Div containing stat dcc.Dropdown with dbc.Rows of player data.
     """
-    rows = get_leaders_layout_rows(df, stat)
+    rows = get_leaders_layout_rows(filters, stat)
     player_options = get_leaders_dropdown_options("All Skaters")
 
     return html.Div(
@@ -375,7 +524,73 @@ def get_leaders_layout(df:object, stat:str, dropdown_id:int | str):
     )
 
 
-def get_leaders_layout_rows(df:object, stat:str):
+def build_leaders_index(df:object, n=10):
+    """
+    Precompute the top 'n' players of every leader stat for every position and position group of a dataFrame.
+    Each stat is ordered once, then every position takes the first 'n' players with a matching position bit.
+    Stats where lower is better are ordered ascending using get_stat_sorting.
+ 
+    Args:
+        df (obj): Unfiltered dataFrame of a single season, season type, and team query.
+        n (int): Number of leaders to keep.
+ 
+    Returns:
+        dict: (position, stat) to list of leader records with 'Name', 'Player', and the stat value.
+    """
+    positions = ["All Skaters", "Forwards", "Defense", "Goalies"] + list(POSITION_BITS)
+    stats = dict.fromkeys(get_leaders_dropdown_options("All Skaters") + get_leaders_dropdown_options("G"))
+    position_masks = df["PositionMask"].to_numpy()
+    
+    index = {}
+    for stat in stats:
+        if stat not in df.columns:
+            continue
+        
+        values = pd.to_numeric(df[stat], errors="coerce").to_numpy(dtype=float)
+        # stable sort keeps the existing row order for ties, missing values are dropped
+        order = np.argsort(values if get_stat_sorting(stat) else -values, kind="stable")
+        order = order[~np.isnan(values[order])]
+        
+        for position in positions:
+            top = order[(position_masks[order] & get_position_mask(position)) != 0][:n]
+            index[(position, stat)] = df.iloc[top][["Name", "Player", stat]].to_dict("records")
+            
+    return index
+
+
+def get_leaders(filters:dict, stat:str):
+    """
+    Return the top 10 players of a stat for the given filters from the leaders index of the current bundle.
+ 
+    Args:
+        filters (dict): Keyword arguments of get_players_bundle along with the selected 'position' and 'position_group'.
+        stat (str): dataFrame stat to display leaders for.
+ 
+    Returns:
+        list[dict]: Leader records with 'Name', 'Player', and the stat value.
+    """
+    bundle = get_players_bundle(filters["season"], filters["season_type"], filters["team"])
+    index = bundle["leaders"][get_skater_type(filters["position"])]
+    
+    return index.get((get_position_filter(filters["position"], filters["position_group"]), stat), [])
+
+
+def get_leader_filters(data:dict, position:str, position_group:str):
+    """
+    Returns the filters used to look up leaders for the stored player data and selected position.
+ 
+    Args:
+        data (dict): Data of the season-stats-df dcc.Store.
+        position (str): A specific position e.g. 'C' or 'All Positions'.
+        position_group (str): The position group. One of 'All Skaters', 'Forwards', 'Defense', 'Goalies'.
+ 
+    Returns:
+        dict: Filters of the stored data with the selected position.
+    """
+    return {**data["filters"], "position": position, "position_group": position_group}
+
+
+def get_leaders_layout_rows(filters:dict, stat:str):
     """
     Return nested Div of dropdown and row data of top 10 players for chosen filtered df.
     DOM tree of: 
@@ -395,44 +610,52 @@ def get_leaders_layout_rows(df:object, stat:str):
     )
  
     Args:
-        df (obj): dataFrame of filtered data to collect top 10 of selected stat.
+        filters (dict): Filters of the displayed data used to look up the top 10 of selected stat.
         stat (str): dataFrame stat to display leaders for.
-        position (str): Player position used to filter df and get top 10 list.
  
     Returns:
         obj: lsit of dbc.Rows of player data.
     """
-    leaders = df.sort_values(stat, ascending=get_stat_sorting(stat)).head(10)
+    leaders = get_leaders(filters, stat)
+    places = player_stat_decimals.get(stat)
     
     # loop through players stats and generate rows and columns of results
     return [
         dbc.Row(
             [
                 dbc.Col(
-                    dcc.Markdown(value["PlayerLink"], style={"height": "1.4rem"}),
+                    html.A(value["Name"], href=f"/player/{value['Player']}", style={"display": "block", "height": "1.4rem"}),
                     width=9,
                 ),
                 dbc.Col(
-                    value[stat], style={"display": "flex", "justifyContent": "end"}
+                    value[stat] if places is None else f"{value[stat]:.{places}f}",
+                    style={"display": "flex", "justifyContent": "end"}
                 ),
             ]
         )
-        for row, value in leaders.iterrows()
+        for value in leaders
     ]
 
 
 def layout():
     # get database data with defaults for current regular season for all teams
-    current_season = asyncio.run(query_player_stats("current_season"))["season"]
-    all_seasons = ["All Seasons"] + [stringify_season(season) for season in asyncio.run(query_player_stats("all_seasons"))["season"]]
+    current_season, all_seasons = run(query_season_metadata())
+    all_seasons = ["All Seasons"] + [stringify_season(season) for season in all_seasons]
     season_types = ["Regular Season"]
     
-    players_df = query_to_formatted_df(build_player_query_url(season=current_season)).sort_values("P", ascending=False)
+    filters = {
+        "season": current_season,
+        "season_type": "Regular Season",
+        "team": "All Teams",
+    }
+    players_bundle = get_players_bundle(**filters)
+    players_data = store_players_bundle(filters)
     
     return html.Div(
         [
-            dcc.Store(data=players_df.to_json(), id="season-stats-df"),
-            get_filter_dropdowns_layout(all_seasons, season_types, get_all_teams(players_df)),
+            dcc.Store(data=players_data, id="season-stats-df"),
+            dcc.Store(id="player-stats-grid-rows"),
+            get_filter_dropdowns_layout(all_seasons, season_types, get_bundle_teams(players_bundle)),
             html.Div(
                 [
                     get_player_position_groups_layout(),
@@ -448,14 +671,23 @@ def layout():
                     ),
                 ]
             ),
-            get_league_leaders_layout(players_df, ["G", "A", "P"]),
+            get_league_leaders_layout(get_leader_filters(players_data, "All Positions", "All Skaters"), ["G", "A", "P"]),
             dls.DualRing(
                 get_agGrid_layout(
-                    players_df,
+                    None,
                     "Forwards",
                     "player-stats-grid",
+                    decimals=player_stat_decimals,
+                    infinite=True,
                     style={"paddingLeft": 50, "paddingRight": 50, "paddingBottom": 50, "height": 800},
-                    dashGridOptions={"pagination": True, "paginationPageSize": 50}
+                    # rows are requested one page at a time - see get_grid_rows
+                    dashGridOptions={
+                        "pagination": True,
+                        "paginationPageSize": 50,
+                        "cacheBlockSize": 50,
+                        "maxBlocksInCache": 10,
+                        "rowBuffer": 0,
+                    },
                 ), 
             width=120),
         ],
@@ -471,7 +703,8 @@ def layout():
 )
 def update_dropdown_teams(season:str, season_type:str, current_team:str):
     season = season.replace("-", "") if season != "All Seasons" else season
-    teams_list = ["All Teams"] + asyncio.run(query_player_stats(f"team/list/{season}?season_type={season_type}"))["teams"]
+    # teams come from the all teams bundle of the season which is shared with the displayed data
+    teams_list = list(get_bundle_teams(get_players_bundle(season, season_type, "All Teams")))
 
     if current_team in teams_list:
         value = no_update
@@ -486,29 +719,20 @@ def update_dropdown_teams(season:str, season_type:str, current_team:str):
     Input("dropdown-season", "value"),
     Input("dropdown-season-type", "value"),
     Input("dropdown-team", "value"),
-    Input("player-position-options", "value"),
-    State("player-position-groups", "value"),
     prevent_initial_call=True
 )
-def update_displayed_data(season:str, season_type:str, team:str, position:str, position_group:str):
+def update_displayed_data(season:str, season_type:str, team:str):
     season = season.replace("-", "") if season != "All Seasons" else season
+    # skaters and goalies are loaded together and positions are filtered by each view of the data
+    filters = {
+        "season": season,
+        "season_type": season_type,
+        "team": team,
+    }
+    # build the bundle once here so the grid and leader board callbacks it triggers find it cached
+    get_players_bundle(**filters)
     
-    if position != "G":
-        df = query_to_formatted_df(build_player_query_url(skater_type="skater", season=season, season_type=season_type, team=team))
-        df = df.sort_values("P", ascending=False)
-    else:
-        df = query_to_formatted_df(build_player_query_url(skater_type="goalie", season=season, season_type=season_type, team=team))
-        df = df.sort_values("W", ascending=False)
-    df = filter_data_by_position(df, position_group)
-    
-    if position != "All Positions":
-        # players may be assigned more than one position
-        # create bool mask to determine if selected position matches any of the player positions
-        mask = df["Position"].apply(lambda x: position in x)
-        
-        df = df[mask]
-    
-    return df.to_json()
+    return store_players_bundle(filters)
 
 
 @callback(
@@ -547,59 +771,105 @@ def update_leader_dropdown_options(position):
 
 
 @callback(
-    Output("player-stats-grid", "rowData"),
     Output("player-stats-grid", "columnDefs"),
     Input("player-position-options", "value"),
-    Input("season-stats-df", "data"),
     prevent_initial_call=True,
 )
-def update_agGrid(player_position:str, data:object):
-    df = pd.read_json(StringIO(data))
-        
-    df = df.rename(columns=rename_data_df_cols)
-    rowData = df.to_dict("records")
-    columnDefs = get_agGrid_columnDefs(player_position)
+def update_agGrid(player_position:str):
+    return get_agGrid_columnDefs(player_position, decimals=player_stat_decimals)
 
-    return rowData, columnDefs
+
+def get_grid_view(data:dict, position:str, sort_model:list, filter_model:dict):
+    """
+    Returns the current player data and the positions of its rows filtered by position, then sorted and filtered for the grid.
+    Row positions are kept per bundle version so paging through the same view doesn't filter or sort the data again,
+    and a refreshed bundle never uses the positions of an older one.
+ 
+    Args:
+        data (dict): Data of the season-stats-df dcc.Store.
+        position (str): The specific position or position group to filter by.
+        sort_model (list): AG Grid sortModel of the request.
+        filter_model (dict): AG Grid filterModel of the request.
+ 
+    Returns:
+        tuple: The player dataFrame, numpy array of the row positions of the view.
+    """
+    bundle = get_players_bundle(**data["filters"])
+    df = bundle[get_skater_type(position)]
+    view_key = (bundle["version"], position, json.dumps(sort_model, sort_keys=True), json.dumps(filter_model, sort_keys=True))
+    positions = grid_views.get(view_key)
+    if positions is None:
+        positions = get_agGrid_row_positions(df, filter_model, sort_model, mask=get_position_rows_mask(df, position)).astype(np.int32)
+        grid_views.set(view_key, positions)
+    
+    return df, positions
 
 
+# blocks of rows are sent in columnar form and rebuilt into the grid's getRowsResponse in the browser
 @callback(
-    Output("rows-leader-stat-1", "children"),
-    Input("dropdown-leader-stat-1", "value"),
-    Input("season-stats-df", "data"),
-    prevent_initial_call=True,
+    Output("player-stats-grid-rows", "data"),
+    Input("player-stats-grid", "getRowsRequest"),
+    State("season-stats-df", "data"),
+    State("player-position-options", "value"),
+    State("player-position-groups", "value"),
 )
-def update_left_leader_stats(stat_left:str, data:object):
-    df = pd.read_json(StringIO(data))
+def get_grid_rows(request:dict, data:dict, position:str, position_group:str):
+    if request is None or data is None:
+        return no_update
     
-    left = get_leaders_layout_rows(df, stat_left)
+    position_filter = get_position_filter(position, position_group)
+    df, positions = get_grid_view(data, position_filter, request.get("sortModel"), request.get("filterModel"))
+    rows = df.iloc[positions[request["startRow"]:request["endRow"]]]
+    
+    return df_to_columnar(rows, rowCount=len(positions))
 
-    return left
 
+clientside_callback(
+    ClientsideFunction(namespace="columnar", function_name="toRowsResponse"),
+    Output("player-stats-grid", "getRowsResponse"),
+    Input("player-stats-grid-rows", "data"),
+    prevent_initial_call=True,
+)
 
-@callback(
-    Output("rows-leader-stat-2", "children"),
-    Input("dropdown-leader-stat-2", "value"),
+
+# new data or a new position clears the grid's cached blocks so it requests rows again
+# the position filter is applied to the stored data on the server without querying it again
+clientside_callback(
+    """
+    function(data, position) {
+        const api = dash_ag_grid.getApi("player-stats-grid");
+        if (api) {
+            api.purgeInfiniteCache();
+        }
+        return window.dash_clientside.no_update;
+    }
+    """,
+    Output("player-stats-grid", "className"),
     Input("season-stats-df", "data"),
+    Input("player-position-options", "value"),
     prevent_initial_call=True,
 )
-def update_center_leader_stats(stat_center:str, data:object):
-    df = pd.read_json(StringIO(data))
-    
-    center = get_leaders_layout_rows(df, stat_center)
-
-    return center
 
 
 @callback(
+    Output("rows-leader-stat-1", "children"),
+    Output("rows-leader-stat-2", "children"),
     Output("rows-leader-stat-3", "children"),
+    Input("dropdown-leader-stat-1", "value"),
+    Input("dropdown-leader-stat-2", "value"),
     Input("dropdown-leader-stat-3", "value"),
     Input("season-stats-df", "data"),
+    Input("player-position-options", "value"),
+    State("player-position-groups", "value"),
     prevent_initial_call=True,
 )
-def update_right_leader_stats(stat_right:str, data:object):
-    df = pd.read_json(StringIO(data))
+def update_leader_stats(stat_left:str, stat_center:str, stat_right:str, data:dict, position:str, position_group:str):
+    # new data or position refreshes every leader board, a stat change only refreshes its own board
+    triggered = set(ctx.triggered_prop_ids.values())
+    data_changed = "season-stats-df" in triggered or "player-position-options" in triggered
+    filters = get_leader_filters(data, position, position_group)
     
-    right = get_leaders_layout_rows(df, stat_right)
-
-    return right
\ No newline at end of file
+    return [
+        get_leaders_layout_rows(filters, stat) if data_changed or f"dropdown-leader-stat-{i}" in triggered else no_update
+        for i, stat in enumerate([stat_left, stat_center, stat_right], start=1)
+    ]
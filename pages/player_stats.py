@@ -7,17 +7,16 @@ import plotly.graph_objs as go
 
 import aiohttp
 import asyncio
-import base64
-import pandas as pd
-import requests
 import numpy as np
 
 from helpers import slugify
 from pathlib import Path
 from io import StringIO
 
-from data_values import TEAM_COLORS, BACKEND_URL
-from helpers import reverse_slugify, rename_data_df_cols, cols_to_percent, get_colors, get_triadics_from_rgba, get_rgba_complement, get_agGrid_layout, stringify_season
+from backend_client import query_backend, run
+from image_cache import cache_image
+from data_values import TEAM_COLORS, PAGE_LOAD_DEADLINE, IMAGE_LOAD_TIMEOUT
+from helpers import reverse_slugify, create_formatted_df, team_stat_decimals, get_colors, get_triadics_from_rgba, get_rgba_complement, get_agGrid_layout, stringify_season
 from .player_404 import player_404_layout
 
 def title(player):
@@ -36,17 +35,21 @@ async def query_player_stats(endpoint):
     Returns:
         json response of data.
     """
-    async with aiohttp.ClientSession() as session:
-        api_url = f"{BACKEND_URL}/api/{endpoint}"
-        async with session.get(api_url) as resp:
-            data = await resp.json()
+    return await query_backend(endpoint)
 
-    return data
 
+async def query_response(query):
+    """
+    Performs an async query to the backend server and returns the status and data of the response.
 
-def get_response(query):
+    Args:
+        query (str): url endpoint to query including and query params.
+
+    Returns:
+        tuple: status code, json response of data or None if the query failed.
+    """
     try:
-        response = asyncio.run(query_player_stats(query))
+        response = await query_player_stats(query)
     except aiohttp.client_exceptions.ContentTypeError:
         return (422, None)
     
@@ -57,50 +60,8 @@ def get_response(query):
         return (200, response)
 
 
-def create_formatted_df(response, index=None, sort_by=None, ascending=False):
-    """
-    Queries backend database for data then formats the returned data into a dataFrame.
-
-    Args:
-        query (str): The url endpoint to query including query params.
-
-    Returns:
-        obj: Formatted dataFrame of database data.
-    """
-    df = pd.json_normalize(response)
-    
-    if index is not None:
-        df= df.set_index(index)
-
-    df = df.rename(columns=rename_data_df_cols)
-    if sort_by is not None:
-        df = df.sort_values(sort_by, ascending=ascending)
-    
-    df = cols_to_percent(df, ["FO %", "Save %", "PP %", "PK %", "Shot %"])
-        
-    rounding = {
-        "G/G": 2,
-        "GA/G": 2,
-        "FO %": 2,
-        "PP %": 2,
-        "PK %": 2,
-        "Save %": 2,
-        "Shot %": 2,
-        "Shots/G": 2,
-        "Shots Against/G": 2,
-    }
-    # df = df.round(rounding)
-    
-    # display issues with rounded floating imprecision
-    # convert to string to truncate
-    # if used in agGrid - grid can convert back to number with proper precision
-    for i in rounding:
-        try:
-            df[i] = df[i].apply(lambda x: f"{x:.{rounding[i]}f}")
-        except (KeyError, TypeError):
-            pass
-    
-    return df
+def get_response(query):
+    return run(query_response(query))
 
 
 def build_player_query_url(endpoint:str, **kwargs):
@@ -120,34 +81,71 @@ def build_player_query_url(endpoint:str, **kwargs):
     return f"{endpoint}?{query_params}"
 
 
-# can't host static images in dash normally outside assets folder
-# encode and decode from image url to render image
-def format_image(image_url:str):
+# images are downloaded once and served locally so browsers can cache them
+async def format_image(image_url:str):
     """
-    Encodes then returns the base64 decoded image supplied from image_url
+    Returns the url of the local copy of the image supplied from image_url.
+    Falls back to the original url if the image can't be downloaded in time.
 
     Args:
-        image_url (str): Path to image file.
+        image_url (str): Remote image url.
 
     Returns:
-        base64 decoded image.
+        str: Image source url.
     """
-    img = requests.get(image_url)
-    uri = ("data:" + img.headers['Content-Type'] + ";base64," + str(base64.b64encode(img.content).decode("utf-8")))
-    return uri
+    try:
+        return await asyncio.wait_for(cache_image(image_url, width=300), IMAGE_LOAD_TIMEOUT)
+    except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
+        return image_url
+
 
-def get_player_card(player_data:object):
+def get_headshot_url(player_data:dict):
+    """
+    Return the decoded url of a player's headshot.
+
+    Args:
+        player_data (dict): json data of a given player.
+
+    Returns:
+        str: Headshot image url.
+    """
+    return player_data["picture"].replace("%3A", ":/").replace("%20", " ")
+
+
+async def query_player_page_data(player:str):
+    """
+    Concurrently queries all data needed to build a player page.
+    The stats query runs alongside the player info query, and the headshot only waits on the player info.
+
+    Args:
+        player (str): Player id from the page url.
+
+    Returns:
+        tuple: (status, data) of player season stats, (status, data) of player info, headshot image.
+    """
+    async def query_info_and_headshot():
+        info_response = await query_response(build_player_query_url(endpoint="players/", player=player))
+        if info_response[0] != 200:
+            return info_response, None
+        return info_response, await format_image(get_headshot_url(info_response[1]))
+
+    stats_response, (info_response, headshot) = await asyncio.gather(
+        query_response(build_player_query_url(endpoint=f"season/skater/{player}")),
+        query_info_and_headshot(),
+    )
+    return stats_response, info_response, headshot
+
+def get_player_card(player_data:object, headshot:str):
     """
     Build and return a card of general player information including logo, division, conference, and inagural season.
 
     Args:
         player_data (DataFrame): DataFrame data of a given player.
+        headshot (str): Image source of the player headshot.
 
     Returns:
         html.Div: Card component of player information.
     """
-    logo = player_data["picture"].replace("%3A", ":/").replace("%20", " ")
-    
     if any([player_data["birth_city"], player_data["birth_state"], player_data["birth_country"]]):
         place = [player_data["birth_city"], player_data["birth_state"], player_data["birth_country"]]
         place = ", ".join([i for i in place if i is not None])
@@ -174,7 +172,7 @@ def get_player_card(player_data:object):
                     [
                         dbc.Col(
                             dbc.CardImg(
-                                src=format_image(logo),
+                                src=headshot,
                                 className="img-fluid rounded-start",
                                 style={"width": 300}
                             ),
@@ -239,21 +237,30 @@ def layout(player=None):
     if player is None:
         return html.Div()
     
-    stats_response = get_response(build_player_query_url(endpoint=f"season/skater/{player}"))
+    try:
+        stats_response, info_response, headshot = run(
+            asyncio.wait_for(query_player_page_data(player), PAGE_LOAD_DEADLINE)
+        )
+    except asyncio.TimeoutError:
+        return player_404_layout(504, player)
+
     if stats_response[0] != 200:
         return player_404_layout(stats_response[0], player)
+    if info_response[0] != 200:
+        return player_404_layout(info_response[0], player)
     
     player_stats = create_formatted_df(stats_response[1], sort_by="Year")
-    player_info = asyncio.run(query_player_stats(build_player_query_url(endpoint="players/", player=player)))
+    player_info = info_response[1]
     
     return html.Div(
         [
-            get_player_card(player_info),
+            get_player_card(player_info, headshot),
             get_agGrid_layout(
                     player_stats,
                     player_info["position"][0],
                     "player-info-grid",
                     add_link=False,
+                    decimals=team_stat_decimals,
                     style={"paddingLeft": 50, "paddingRight": 50, "paddingBottom": 50},
                     dashGridOptions = {"domLayout": "autoHeight"}
                 ), 
@@ -7,6 +7,8 @@ def team_404_layout(status, team_id):
         h1_text = f"{status}: Invalid team name entered."
     elif status == 404:
         h1_text = f"{status}: Sorry, {team_id} could not be found."
+    elif status == 504:
+        h1_text = f"{status}: Sorry, {team_id} took too long to load."
         
     return html.Div(
         [
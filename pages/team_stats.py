@@ -1,5 +1,5 @@
 import dash
-from dash import html, dcc, callback, Input, Output, State, Patch
+from dash import html, dcc, callback, clientside_callback, ClientsideFunction, Input, Output, State, Patch, ctx, no_update
 import dash_bootstrap_components as dbc
 import dash_loading_spinners as dls
 import dash_ag_grid as dag
@@ -7,17 +7,18 @@ import plotly.graph_objs as go
 
 import aiohttp
 import asyncio
-import base64
 import pandas as pd
-import requests
 import numpy as np
 
 from helpers import slugify
 from pathlib import Path
 from io import StringIO
 
-from data_values import TEAM_COLORS, BACKEND_URL
-from helpers import reverse_slugify, rename_data_df_cols, cols_to_percent, get_colors, get_triadics_from_rgba, get_rgba_complement, get_agGrid_layout, stringify_season
+from backend_client import query_backend, get_cached_frame, get_cache_version, disk_cache, run
+from cache import TTLCache
+from image_cache import cache_image
+from data_values import PAGE_LOAD_DEADLINE, IMAGE_LOAD_TIMEOUT, LAYOUT_CACHE_MAX_ENTRIES, LAYOUT_CACHE_TTL
+from helpers import reverse_slugify, create_formatted_df, get_stat_sorting, team_stat_decimals, TEAM_PALETTES, get_team_palette_class, get_agGrid_layout, get_columnar_store, stringify_season
 from .team_404 import team_404_layout
 
 
@@ -27,6 +28,8 @@ def title(team):
 
 dash.register_page(__name__, path_template="/teams/<team>", title=title)
 
+layout_cache = TTLCache(max_entries=LAYOUT_CACHE_MAX_ENTRIES, default_ttl=LAYOUT_CACHE_TTL)
+
 
 async def query_team_stats(endpoint):
     """
@@ -38,17 +41,21 @@ async def query_team_stats(endpoint):
     Returns:
         json response of data.
     """
-    async with aiohttp.ClientSession() as session:
-        api_url = f"{BACKEND_URL}/api/{endpoint}"
-        async with session.get(api_url) as resp:
-            data = await resp.json()
+    return await query_backend(endpoint)
 
-    return data
 
+async def query_response(query):
+    """
+    Performs an async query to the backend server and returns the status and data of the response.
 
-def get_response(query):
+    Args:
+        query (str): url endpoint to query including and query params.
+
+    Returns:
+        tuple: status code, json response of data or None if the query failed.
+    """
     try:
-        response = asyncio.run(query_team_stats(query))
+        response = await query_team_stats(query)
     except aiohttp.client_exceptions.ContentTypeError:
         return (422, None)
     
@@ -59,50 +66,8 @@ def get_response(query):
         return (200, response)
 
 
-def create_formatted_df(response, index=None, sort_by=None, ascending=False):
-    """
-    Queries backend database for data then formats the returned data into a dataFrame.
-
-    Args:
-        query (str): The url endpoint to query including query params.
-
-    Returns:
-        obj: Formatted dataFrame of database data.
-    """
-    df = pd.json_normalize(response)
-    
-    if index is not None:
-        df= df.set_index(index)
-
-    df = df.rename(columns=rename_data_df_cols)
-    if sort_by is not None:
-        df = df.sort_values(sort_by, ascending=ascending)
-    
-    df = cols_to_percent(df, ["FO %", "Save %", "PP %", "PK %", "Shot %"])
-        
-    rounding = {
-        "G/G": 2,
-        "GA/G": 2,
-        "FO %": 2,
-        "PP %": 2,
-        "PK %": 2,
-        "Save %": 2,
-        "Shot %": 2,
-        "Shots/G": 2,
-        "Shots Against/G": 2,
-    }
-    # df = df.round(rounding)
-    
-    # display issues with rounded floating imprecision
-    # convert to string to truncate
-    # if used in agGrid - grid can convert back to number with proper precision
-    for i in rounding:
-        try:
-            df[i] = df[i].apply(lambda x: f"{x:.{rounding[i]}f}")
-        except (KeyError, TypeError):
-            pass
-    
-    return df
+def get_response(query):
+    return run(query_response(query))
 
 
 def build_team_query_url(endpoint:str, **kwargs):
@@ -122,34 +87,99 @@ def build_team_query_url(endpoint:str, **kwargs):
     return f"{endpoint}?{query_params}"
 
 
-# can't host static images in dash normally outside assets folder
-# encode and decode from image url to render image
-def format_image(image_url:str):
+def get_season_games_df(season:int):
+    """
+    Return formatted league data for each game of a season.
+    Loaded once per season and shared between callbacks and workers through the disk cache.
+
+    Args:
+        season (int): The full season e.g. 20232024.
+
+    Returns:
+        DataFrame: League game data sorted by game number.
+    """
+    endpoint = build_team_query_url(endpoint="games/results/season", season=season)
+    return get_cached_frame(endpoint, lambda: create_formatted_df(run(query_team_stats(endpoint)), index="id", sort_by="Game", ascending=True))
+
+
+def get_season_teams_df(season:int):
+    """
+    Return formatted season data of every team for a season.
+    Loaded once per season and shared between callbacks and workers through the disk cache.
+
+    Args:
+        season (int): The full season e.g. 20232024.
+
+    Returns:
+        DataFrame: Season data with a row for each team.
+    """
+    endpoint = build_team_query_url(endpoint="season/team/", season=season)
+    return get_cached_frame(endpoint, lambda: create_formatted_df(run(query_team_stats(endpoint)), index="id"))
+
+
+# images are downloaded once and served locally so browsers can cache them
+async def format_image(image_url:str):
+    """
+    Returns the url of the local copy of the image supplied from image_url.
+    Falls back to the original url if the image can't be downloaded in time.
+
+    Args:
+        image_url (str): Remote image url.
+
+    Returns:
+        str: Image source url.
+    """
+    try:
+        return await asyncio.wait_for(cache_image(image_url), IMAGE_LOAD_TIMEOUT)
+    except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
+        return image_url
+
+
+async def query_team_page_data(team_name:str):
     """
-    Encodes then returns the base64 decoded image supplied from image_url
+    Concurrently queries all data needed to build a team page.
+    The current season games and league queries only wait on the current season lookup and the logo only waits on the team query.
 
     Args:
-        image_url (str): Path to image file.
+        team_name (str): Full team name e.g. 'Dallas Stars'.
 
     Returns:
-        base64 decoded image.
+        tuple: current season, (status, data) of team seasons, (status, data) of current season games, 
+            (status, data) of current season league data, team logo image.
     """
-    img = requests.get(image_url)
-    uri = ("data:" + img.headers['Content-Type'] + ";base64," + str(base64.b64encode(img.content).decode("utf-8")))
-    return uri
+    async def query_current_season_games():
+        current_season = (await query_team_stats("season/current_season"))["season"]
+        games_response, league_response = await asyncio.gather(
+            query_response(build_team_query_url(endpoint="games/results/season", season=current_season)),
+            query_response(build_team_query_url(endpoint="season/team/", season=current_season)),
+        )
+        return current_season, games_response, league_response
+
+    async def query_team_and_logo():
+        team_response = await query_response(build_team_query_url(endpoint="season/team/", team_name=team_name))
+        if team_response[0] != 200:
+            return team_response, None
+        latest_season = max(team_response[1], key=lambda x: x["season"])
+        return team_response, await format_image(latest_season["team"]["logo"])
+
+    (current_season, games_response, league_response), (team_response, logo) = await asyncio.gather(
+        query_current_season_games(),
+        query_team_and_logo(),
+    )
+    return current_season, team_response, games_response, league_response, logo
 
 
-def get_team_card(team_data:object):
+def get_team_card(team_data:object, logo:str):
     """
     Build and return a card of general team information including logo, division, conference, and inagural season.
 
     Args:
         team_data (DataFrame): DataFrame data of a given team.
+        logo (str): Image source of the team logo.
 
     Returns:
         html.Div: Card component of team information.
     """
-    logo = team_data["team.logo"]
     return html.Div(
         dbc.Card(
             [
@@ -157,7 +187,7 @@ def get_team_card(team_data:object):
                     [
                         dbc.Col(
                             dbc.CardImg(
-                                src=format_image(logo),
+                                src=logo,
                                 className="img-fluid rounded-start",
                                 style={"width": 200}
                             ),
@@ -213,13 +243,14 @@ def get_team_card(team_data:object):
     )
 
 
-def get_season_summary(team_data:object, layout_id:[int, str]):
+def get_season_summary(team_data:object, layout_id:[int, str], rank="N/A"):
     """
     Return a list of dbc.Rows containing general season stats for a given team.
 
     Args:
         team_data (DataFrame): DataFrame data of a given team.
         layout_id (int, str): Ids applied to each season stat component used to sync data with a tooltip.
+        rank (int, str): League rank of the team by points.
 
     Returns:
         list: dbc.Rows of season stat headers and data synced with tooltip information.
@@ -249,8 +280,7 @@ def get_season_summary(team_data:object, layout_id:[int, str]):
                     dbc.Col("0", width=1, style=col_style),
                     dbc.Col(team_data["OTL"], width=1, style=col_style),
                     dbc.Col(team_data["P"], width=1, style=col_style),
-                    # dbc.Col(team_data["Rank"], width=1, style=col_style),
-                    dbc.Col("N/A", width=1, style=col_style),
+                    dbc.Col(rank, width=1, style=col_style),
                 ],
                 style={"color": "white"}
             ),
@@ -268,7 +298,7 @@ def get_single_season_dropdown(team_name:str, options:list, id:str):
     Return a team-specific stylized dcc.Dropdown of 'options'.
 
     Args:
-        team_name (str): Team name used to get specific colors to style dropdown.
+        team_name (str): Team name of the dropdown. Colors come from the team palette class of the page.
         options (list): List of values to fill the dropdown options with.
         id (str): Id of dropdown component.
 
@@ -281,23 +311,76 @@ def get_single_season_dropdown(team_name:str, options:list, id:str):
             clearable=False,
             searchable=False,
             id=id,
+            # colors come from the team palette class of the page
             className="team-stats team-colored-dropdown",
-            style={
-                "width": "200px",
-                "backgroundColor": get_colors(team_name, "secondary"),
-                "--team-text-color-primary": get_colors(team_name, "primary_text"),
-                "--team-text-color-secondary": get_colors(team_name, "secondary_text"),
-                "--team-color-primary": get_colors(team_name, "primary"),
-                "--team-color-secondary": get_colors(team_name, "secondary")
-            },
+            style={"width": "200px"},
         )    
 
-def get_single_season_ranks_y_values(df:object, team_name:str, stat:str, num_points=2):
+def build_season_summary_table(df:object):
+    """
+    Calculate league min, average, max, and each team's rank and percentile for every numeric stat of a season.
+    Ranks put the best value first using get_stat_sorting, with ties sharing the best rank.
+    Percentiles are the fraction of teams a team is as good as or better than.
+
+    Args:
+        df (DataFrame): Single season league data with a row for each team.
+
+    Returns:
+        dict: 'league' DataFrame of min, mean, and max by stat and 'values', 'ranks', 'percentiles' DataFrames of teams by stats.
+    """
+    values = df.set_index("Team").select_dtypes("number")
+    ascending = {col: get_stat_sorting(col) for col in values.columns}
+    
+    return {
+        "league": values.agg(["min", "mean", "max"]).T,
+        "values": values,
+        "ranks": values.apply(lambda col: col.rank(ascending=ascending[col.name], method="min")),
+        "percentiles": values.apply(lambda col: col.rank(ascending=not ascending[col.name], method="max", pct=True)),
+    }
+
+
+def get_season_summary_table(season:int, league_df=None):
+    """
+    Return the league summary table of a season, building it on a cache miss.
+    Shared between team pages and workers through the disk cache.
+
+    Args:
+        season (int): The full season e.g. 20232024.
+        league_df (DataFrame): Season data of every team if already loaded. Loaded with get_season_teams_df otherwise.
+
+    Returns:
+        dict: League summary table from build_season_summary_table.
+    """
+    endpoint = build_team_query_url(endpoint="season/team/", season=season)
+    return get_cached_frame(
+        endpoint,
+        lambda: build_season_summary_table(league_df if league_df is not None else get_season_teams_df(season)),
+        prefix="summary"
+    )
+
+
+def get_team_rank(summary_table:dict, team_name:str, stat="P"):
     """
-    Calculate and return y-value graph pairs for league min, max, avg, and team data of given stat.
+    Return the league rank of a team for a stat or 'N/A' if the team didn't play in the season.
 
     Args:
-        df (DataFrame): Single season league data.
+        summary_table (dict): League summary table from build_season_summary_table.
+        team_name (str): Team name to get the rank of.
+        stat (str): Stat to rank teams by.
+
+    Returns:
+        int, str: League rank of the team.
+    """
+    rank = summary_table["ranks"][stat].get(team_name)
+    return "N/A" if rank is None or pd.isna(rank) else int(rank)
+
+
+def get_single_season_ranks_y_values(summary_table:dict, team_name:str, stat:str, num_points=2):
+    """
+    Return y-value graph pairs for league min, max, avg, and team data of given stat.
+
+    Args:
+        summary_table (dict): League summary table from build_season_summary_table.
         team_name (str): Team name to get data from.
         stat (str): Specific stat to plot.
         num_points (int): Number of copies of y-data to match the number of x-points needed.
@@ -305,20 +388,18 @@ def get_single_season_ranks_y_values(df:object, team_name:str, stat:str, num_poi
     Returns:
         tuple: team stat data, league low data, league average data, league max data.
     """
-    team_data = [df[df["Team"] == team_name][stat].iloc[0]] * num_points
-    lowest_data = [df[stat].min()] * num_points
-    avg_data = [df[stat].mean()] * num_points
-    highest_data = [df[stat].max()] * num_points
+    lowest, avg, highest = summary_table["league"].loc[stat, ["min", "mean", "max"]]
+    team_data = [summary_table["values"].at[team_name, stat]] * num_points
     
-    return team_data, lowest_data, avg_data, highest_data
+    return team_data, [lowest] * num_points, [avg] * num_points, [highest] * num_points
 
 
-def get_single_season_rankings_plot(df:object, team_name:str, stat:str):
+def get_single_season_rankings_plot(summary_table:dict, team_name:str, stat:str):
     """
     Return a team specific themed dcc.Graph of league season data for a given stat.
 
     Args:
-        df (DataFrame): Single season league data.
+        summary_table (dict): League summary table from build_season_summary_table.
         team_name (str): Team name to get data from and style graph colors.
         stat (str): Specific stat to plot.
 
@@ -326,16 +407,15 @@ def get_single_season_rankings_plot(df:object, team_name:str, stat:str):
         dcc.Graph: Team color themed graph of team data, league min, league max, and league average.
     """
     x = [0, 1] # two points to make a line - not a single point
-    team_data, lowest_data, avg_data, highest_data = get_single_season_ranks_y_values(df, team_name, stat, len(x))
-    
-    primary_color = get_colors(team_name, "primary")
-    secondary_color = get_colors(team_name, "secondary")
-    secondary_text_color = get_colors(team_name, "secondary_text")
+    team_data, lowest_data, avg_data, highest_data = get_single_season_ranks_y_values(summary_table, team_name, stat, len(x))
     
-    raw_primary_color = TEAM_COLORS[team_name]["primary"]
-    triadic_primary_one, triadic_primary_two = get_triadics_from_rgba(raw_primary_color)
-    
-    primary_complement = get_rgba_complement(raw_primary_color)
+    palette = TEAM_PALETTES[team_name]
+    primary_color = palette["primary"]
+    secondary_color = palette["secondary"]
+    secondary_text_color = palette["secondary_text"]
+    triadic_primary_one = palette["primary_triadic_one"]
+    triadic_primary_two = palette["primary_triadic_two"]
+    primary_complement = palette["primary_complement"]
     
     figure = go.Figure(
         [
@@ -378,53 +458,105 @@ def get_single_season_rankings_plot(df:object, team_name:str, stat:str):
     )
     
 
-def get_single_season_games_y_values(df:object, team_name:str, stat:str):
+def build_games_envelope(df:object):
+    """
+    Calculate cumulative sums of every numeric stat for each team and game of a season in a single pass.
+    Sums are stored as a games x teams x stats array along with the league min, average, and max of each game.
+    Games a team hasn't played yet are NaN and left out of the league values.
+
+    Args:
+        df (DataFrame): League data for each game of a single season.
+
+    Returns:
+        dict: 'games', 'teams', and 'stats' labels of each axis, 'sums' array, and 'lowest', 'average', 'highest' games x stats arrays.
+    """
+    stats = [i for i in df.select_dtypes("number").columns if i not in ("Game", "Season")]
+    games = np.sort(pd.unique(df["Game"]))
+    teams = np.sort(pd.unique(df["Team"]))
+
+    values = np.full((len(games), len(teams), len(stats)), np.nan)
+    values[np.searchsorted(games, df["Game"].values), np.searchsorted(teams, df["Team"].values)] = df[stats].to_numpy(dtype=float)
+
+    played = ~np.isnan(values)
+    sums = np.where(played, np.nancumsum(values, axis=0), np.nan)
+
+    return {
+        "games": games,
+        "teams": {team: i for i, team in enumerate(teams)},
+        "stats": {stat: i for i, stat in enumerate(stats)},
+        "sums": sums,
+        "lowest": np.nanmin(sums, axis=1),
+        "average": np.nanmean(sums, axis=1),
+        "highest": np.nanmax(sums, axis=1),
+    }
+
+
+def get_games_envelope(season:int, games_df=None):
+    """
+    Return the cumulative league game data of a season, building it on a cache miss.
+    Envelopes are the same for every team, so they are shared between team pages and workers through the disk cache.
+
+    Args:
+        season (int): The full season e.g. 20232024.
+        games_df (DataFrame): League data for each game of the season if already loaded. Loaded with get_season_games_df otherwise.
+
+    Returns:
+        dict: Cumulative league game data from build_games_envelope.
     """
-    Calculate and return cumulative sum y-value graph pairs for league min, max, avg, and team data of given stat for each game.
+    endpoint = build_team_query_url(endpoint="games/results/season", season=season)
+    return get_cached_frame(
+        endpoint,
+        lambda: build_games_envelope(games_df if games_df is not None else get_season_games_df(season)),
+        prefix="envelope"
+    )
+
+
+def get_single_season_games_y_values(envelope:dict, team_name:str, stat:str):
+    """
+    Return cumulative sum y-value graph pairs for league min, max, avg, and team data of given stat for each game.
 
     Args:
-        df (DataFrame): League data for each game.
+        envelope (dict): Cumulative league game data from build_games_envelope.
+        team_name (str): Team name to get data from.
         stat (str): Specific stat to plot.
 
     Returns:
         tuple: team stat data, league low data, league average data, league max data.
-    """    
-    # calculate cumulative of stat for each successive game
-    game_df = df.copy()
-    team_sum = game_df[game_df["Team"] == team_name][stat].cumsum().values
-    game_df["sums"] = game_df.groupby("Team")[stat].cumsum()
-    lowest_data = game_df.groupby("Game")["sums"].min().values
-    avg_data = game_df.groupby("Game")["sums"].mean().values
-    highest_data = game_df.groupby("Game")["sums"].max().values
+    """
+    stat_index = envelope["stats"][stat]
+    team_sum = envelope["sums"][:, envelope["teams"][team_name], stat_index]
+    team_sum = team_sum[~np.isnan(team_sum)]
+    lowest_data = envelope["lowest"][:, stat_index]
+    avg_data = envelope["average"][:, stat_index]
+    highest_data = envelope["highest"][:, stat_index].copy()
     highest_data[np.argmax(highest_data):] = np.max(highest_data)
     
     return team_sum, lowest_data, avg_data, highest_data
 
 
-def get_single_season_games_plot(df:object, team_name:str, stat:str):
+def get_single_season_games_plot(envelope:dict, team_name:str, stat:str):
     """
     Return a team specific themed dcc.Graph of league game data for a given stat.
 
     Args:
-        df (DataFrame): League game specific data.
+        envelope (dict): Cumulative league game data from build_games_envelope.
         team_name (str): Team name to get data from and style graph colors.
         stat (str): Specific stat to plot.
 
     Returns:
         dcc.Graph: Team color themed graph of team data, league min, league max, and league average.
     """
-    sums, lowest_data, avg_data, highest_data = get_single_season_games_y_values(df, team_name, stat)
-    
-    x = pd.unique(df["Game"])
-    
-    primary_color = get_colors(team_name, "primary")
-    secondary_color = get_colors(team_name, "secondary")
-    secondary_text_color = get_colors(team_name, "secondary_text")
+    sums, lowest_data, avg_data, highest_data = get_single_season_games_y_values(envelope, team_name, stat)
     
-    raw_primary_color = TEAM_COLORS[team_name]["primary"]
-    triadic_primary_one, triadic_primary_two = get_triadics_from_rgba(raw_primary_color)
+    x = envelope["games"]
     
-    primary_complement = get_rgba_complement(raw_primary_color)
+    palette = TEAM_PALETTES[team_name]
+    primary_color = palette["primary"]
+    secondary_color = palette["secondary"]
+    secondary_text_color = palette["secondary_text"]
+    triadic_primary_one = palette["primary_triadic_one"]
+    triadic_primary_two = palette["primary_triadic_two"]
+    primary_complement = palette["primary_complement"]
     
     figure = go.Figure(
         [
@@ -468,57 +600,58 @@ def get_single_season_games_plot(df:object, team_name:str, stat:str):
     )
 
 
-def layout(team=None):
-    if team is None:
-        return html.Div()
+def build_team_layout(team:str):
+    """
+    Query all data of a team page and build its layout.
 
-    CURRENT_SEASON = asyncio.run(query_team_stats("season/current_season"))["season"]
+    Args:
+        team (str): Slugified team name from the page url.
+
+    Returns:
+        tuple: status code, page layout. Error statuses return the 404 page layout.
+    """
+    try:
+        CURRENT_SEASON, team_response, games_response, league_response, logo = run(
+            asyncio.wait_for(query_team_page_data(reverse_slugify(team)), PAGE_LOAD_DEADLINE)
+        )
+    except asyncio.TimeoutError:
+        return 504, team_404_layout(504, team)
 
-    team_response = get_response(build_team_query_url(endpoint="season/team/", team_name=reverse_slugify(team)))
     if team_response[0] != 200:
-        return team_404_layout(team_response[0], team)
+        return team_response[0], team_404_layout(team_response[0], team)
     team_df = create_formatted_df(team_response[1], index="id", sort_by="Season", ascending=False)
     
-    current_season_df = team_df[team_df["Year"] == int(str(CURRENT_SEASON)[:4])]
-    
-    games_response = get_response(build_team_query_url(endpoint="games/results/season", season=CURRENT_SEASON))
     if games_response[0] != 200:
-        return team_404_layout(games_response[0], team)
+        return games_response[0], team_404_layout(games_response[0], team)
     games_df = create_formatted_df(games_response[1], index="id", sort_by="Game", ascending=True)
-
-    primary_color = get_colors(reverse_slugify(team), "primary")
-    primary_color_soft = TEAM_COLORS[reverse_slugify(team)]["primary"][:-1] + (0.5, )
-    secondary_color = get_colors(reverse_slugify(team), "secondary")
-    secondary_color_soft = TEAM_COLORS[reverse_slugify(team)]["secondary"][:-1] + (0.5, )
-    secondary_color_softer = TEAM_COLORS[reverse_slugify(team)]["secondary"][:-1] + (0.9, )
+    games_envelope = get_games_envelope(CURRENT_SEASON, games_df)
     
+    if league_response[0] != 200:
+        return league_response[0], team_404_layout(league_response[0], team)
+    summary_table = get_season_summary_table(CURRENT_SEASON, create_formatted_df(league_response[1], index="id"))
+    rank = get_team_rank(summary_table, reverse_slugify(team)) if str(team_df.iloc[0]["Season"]) == str(CURRENT_SEASON) else "N/A"
+
     excluded = ["gp", "game", "rank", "logo", "conference", "division", "city", "state"]
-    team_cols = [i for i in current_season_df.columns if "team" not in i.lower() and "season" not in i.lower() and not any([j in i.lower() for j in excluded])]
-    game_cols = [i for i in games_df.columns if "team" not in i.lower() and "season" not in i.lower() and not any([j in i.lower() for j in excluded])]    
+    team_cols = [i for i in summary_table["values"].columns if "team" not in i.lower() and "season" not in i.lower() and not any([j in i.lower() for j in excluded])]
+    game_cols = [i for i in games_df.columns if i in games_envelope["stats"] and "team" not in i.lower() and "season" not in i.lower() and not any([j in i.lower() for j in excluded])]
 
-    return html.Div(
+    return 200, html.Div(
         [
-            # dcc.Store(data=current_season_df.to_json(), id="team-stats-df"),
             # dcc.Store(data=games_df.to_json(), id="game-data-df"),
             dcc.Store(data=team, id="team-name"),
+            get_columnar_store(team_df, "team-stats-grid"),
             
-            get_team_card(team_df.iloc[0]),
-            html.Div(get_season_summary(team_df.iloc[0], layout_id=1), id="current-season-summary"),
+            get_team_card(team_df.iloc[0], logo),
+            html.Div(get_season_summary(team_df.iloc[0], layout_id=1, rank=rank), id="current-season-summary"),
             dls.DualRing(
                 get_agGrid_layout(
                     team_df, 
                     "Team", 
                     "team-stats-grid", 
                     className="ag-theme-alpine team-grid",
-                    style={
-                        "padding": 50,
-                        "height": 500,
-                        "--team-text-color-primary": get_colors(reverse_slugify(team), "primary_text"),
-                        "--team-text-color-secondary": get_colors(reverse_slugify(team), "secondary_text"),
-                        "--team-color-primary": f"rgba{primary_color_soft}",
-                        "--team-color-secondary-soft": f"rgba{secondary_color_soft}",
-                        "--team-color-secondary-softer": f"rgba{secondary_color_softer}",
-                    },
+                    style={"padding": 50, "height": 500},
+                    decimals=team_stat_decimals,
+                    columnar=True,
                     dashGridOptions={"pagination": True, "paginationPageSize": 15},
                 ),
             ),
@@ -531,7 +664,7 @@ def layout(team=None):
                 ],
                 style={"display": "flex", "justifyContent": "center"}
             ),
-            dls.DualRing(html.Div(get_season_summary(team_df.iloc[0], layout_id=2), id="selected-season-summary", style={"marginTop": "2%"})),  
+            dls.DualRing(html.Div(get_season_summary(team_df.iloc[0], layout_id=2, rank=rank), id="selected-season-summary", style={"marginTop": "2%"})),  
             html.Div(
                 [
                     html.Div(
@@ -554,52 +687,89 @@ def layout(team=None):
             ),
             html.Div(
                 [
-                    get_single_season_games_plot(games_df[games_df["Season"] == CURRENT_SEASON], reverse_slugify(team), "G"),
-                    get_single_season_rankings_plot(current_season_df, reverse_slugify(team), "W"),
+                    get_single_season_games_plot(games_envelope, reverse_slugify(team), "G"),
+                    get_single_season_rankings_plot(summary_table, reverse_slugify(team), "W"),
                 ],
                 style={"display": "flex", "justifyContent": "space-evenly"}
             ),
             html.Div(style={"minHeight": 700})
         ],
-        style={"backgroundImage": f"linear-gradient(to bottom right, {primary_color}, {secondary_color})"}
+        # team colors of every child component are css custom properties set by the palette class
+        className=f"team-page {get_team_palette_class(reverse_slugify(team))}",
     )
 
 
-@callback(
-    Output("selected-season-summary", "children"),
-    Input("single-season-season-dropdown", "value"),
-    State("team-name", "data"),
-    prevent_initial_call=True
-)
-def update_selected_season_summary(year, team_name):
-    season = int(f"{year}{year + 1}")
-    team_response = get_response(build_team_query_url(endpoint="season/team/", season=season, team_name=reverse_slugify(team_name)))
-    team_df = create_formatted_df(team_response[1], index="id")
-    return get_season_summary(team_df.iloc[0], layout_id=2)
+def get_layout_key(team:str):
+    """
+    Return the cache key of a rendered team page.
+    Pages change with the current season and whenever the cached data is invalidated.
 
+    Args:
+        team (str): Slugified team name from the page url.
 
-@callback(
-    Output("single-season-game-graph", "figure"),
-    Input("single-season-games-stat-dropdown", "value"),
-    Input("single-season-season-dropdown", "value"),
-    State("team-name", "data"),
-    prevent_initial_call=True
+    Returns:
+        str: Layout cache key.
+    """
+    current_season = run(asyncio.wait_for(query_team_stats("season/current_season"), PAGE_LOAD_DEADLINE))["season"]
+    return f"layout:teams/{team}:{current_season}:{disk_cache.get_version()}"
+
+
+def layout(team=None):
+    if team is None:
+        return html.Div()
+
+    try:
+        key = get_layout_key(team)
+    except asyncio.TimeoutError:
+        return team_404_layout(504, team)
+
+    # the same layout is served to every visitor, only successful pages are kept
+    # in-process pages are also keyed by cache version so invalidating the caches drops them when the disk cache is off
+    memory_key = (key, get_cache_version())
+    page = layout_cache.get(memory_key)
+    if page is None:
+        page = disk_cache.get(key)
+        if page is None:
+            status, page = build_team_layout(team)
+            if status != 200:
+                return page
+            disk_cache.set(key, page, LAYOUT_CACHE_TTL)
+        layout_cache.set(memory_key, page)
+
+    return page
+
+
+clientside_callback(
+    ClientsideFunction(namespace="columnar", function_name="toRowData"),
+    Output("team-stats-grid", "rowData"),
+    Input("team-stats-grid-columnar", "data"),
 )
-def update_game_fig(game_stat, year, team_name):
-    season = int(f"{year}{year + 1}")
-    games_response = get_response(build_team_query_url(endpoint="games/results/season", season=season))
-    game_df = create_formatted_df(games_response[1], index="id", sort_by="Game", ascending=True)
+
+
+def get_game_fig_patch(season:int, team_name:str, game_stat:str):
+    """
+    Return a Patch of the single season game graph for a season and stat.
+
+    Args:
+        season (int): The full season e.g. 20232024.
+        team_name (str): Team name to get data from.
+        game_stat (str): Specific game stat to plot.
+
+    Returns:
+        Patch: Updated x and y data of each trace and the y-axis title.
+    """
+    games_envelope = get_games_envelope(season)
     
     # patch to only update specific parts of figure instead of re-drawing the entire figure
     game_fig_patch = Patch()
-    game_team_data, lowest_game_data, avg_game_data, highest_game_data = get_single_season_games_y_values(game_df, reverse_slugify(team_name), game_stat)
-    game_fig_patch["data"][0]["x"] = pd.unique(game_df["Game"])
+    game_team_data, lowest_game_data, avg_game_data, highest_game_data = get_single_season_games_y_values(games_envelope, team_name, game_stat)
+    game_fig_patch["data"][0]["x"] = games_envelope["games"]
     game_fig_patch["data"][0]["y"] = lowest_game_data
-    game_fig_patch["data"][1]["x"] = pd.unique(game_df["Game"])
+    game_fig_patch["data"][1]["x"] = games_envelope["games"]
     game_fig_patch["data"][1]["y"] = avg_game_data
-    game_fig_patch["data"][2]["x"] = pd.unique(game_df["Game"])
+    game_fig_patch["data"][2]["x"] = games_envelope["games"]
     game_fig_patch["data"][2]["y"] = highest_game_data
-    game_fig_patch["data"][3]["x"] = pd.unique(game_df["Game"])
+    game_fig_patch["data"][3]["x"] = games_envelope["games"]
     game_fig_patch["data"][3]["y"] = game_team_data
     
     game_fig_patch["layout"]["yaxis"]["title"]["text"] = game_stat
@@ -607,23 +777,57 @@ def update_game_fig(game_stat, year, team_name):
     return game_fig_patch
 
 
+def get_season_fig_patch(summary_table:dict, team_name:str, season_stat:str):
+    """
+    Return a Patch of the single season rankings graph for a stat.
+
+    Args:
+        summary_table (dict): League summary table from build_season_summary_table.
+        team_name (str): Team name to get data from.
+        season_stat (str): Specific season stat to plot.
+
+    Returns:
+        Patch: Updated y data of each trace.
+    """
+    season_fig_patch = Patch()
+    season_team_data, lowest_season_data, avg_season_data, highest_season_data = get_single_season_ranks_y_values(summary_table, team_name, season_stat)
+    season_fig_patch["data"][0]["y"] = lowest_season_data
+    season_fig_patch["data"][1]["y"] = avg_season_data
+    season_fig_patch["data"][2]["y"] = highest_season_data
+    season_fig_patch["data"][3]["y"] = season_team_data
+    
+    return season_fig_patch
+
+
 @callback(
+    Output("selected-season-summary", "children"),
+    Output("single-season-game-graph", "figure"),
     Output("single-season-rankings-graph", "figure"),
-    Input("single-season-season-stat-dropdown", "value"),
     Input("single-season-season-dropdown", "value"),
+    Input("single-season-games-stat-dropdown", "value"),
+    Input("single-season-season-stat-dropdown", "value"),
     State("team-name", "data"),
     prevent_initial_call=True
 )
-def update_season_fig(season_stat, year, team_name):
-    season = f"{year}{year + 1}"
-    team_response = get_response(build_team_query_url(endpoint="season/team/", season=season))
-    team_df = create_formatted_df(team_response[1], index="id")
+def update_single_season(year, game_stat, season_stat, team_name):
+    # a season change refreshes the summary and both figures, a stat change only refreshes its own figure
+    triggered = set(ctx.triggered_prop_ids.values())
+    season_changed = "single-season-season-dropdown" in triggered
+    season = int(f"{year}{year + 1}")
+    team_name = reverse_slugify(team_name)
     
-    season_fig_patch = Patch()
-    season_team_data, lowest_season_data, avg_season_data, highest_season_data = get_single_season_ranks_y_values(team_df, reverse_slugify(team_name), season_stat)
-    season_fig_patch["data"][0]["y"] = lowest_season_data
-    season_fig_patch["data"][1]["y"] = avg_season_data
-    season_fig_patch["data"][2]["y"] = highest_season_data
-    season_fig_patch["data"][3]["y"] = season_team_data
+    summary = no_update
+    game_fig_patch = no_update
+    season_fig_patch = no_update
+    
+    if season_changed or "single-season-season-stat-dropdown" in triggered:
+        summary_table = get_season_summary_table(season)
+        season_fig_patch = get_season_fig_patch(summary_table, team_name, season_stat)
+        if season_changed:
+            team_df = get_season_teams_df(season)
+            summary = get_season_summary(team_df[team_df["Team"] == team_name].iloc[0], layout_id=2, rank=get_team_rank(summary_table, team_name))
+    
+    if season_changed or "single-season-games-stat-dropdown" in triggered:
+        game_fig_patch = get_game_fig_patch(season, team_name, game_stat)
     
-    return season_fig_patch
\ No newline at end of file
+    return summary, game_fig_patch, season_fig_patch
@@ -0,0 +1,108 @@
+import re
+import unicodedata
+
+from bisect import bisect_left
+
+from backend_client import query_backend, run
+from cache import TTLCache
+from data_values import BACKEND_CACHE_TTL_METADATA, PLAYER_SEARCH_LIMIT
+
+# prefix index of all player names, rebuilt when the names are refreshed
+name_index_cache = TTLCache(max_entries=1, default_ttl=BACKEND_CACHE_TTL_METADATA)
+
+
+async def query_all_player_names():
+    """
+    Performs an async query to the backed server to get all player names.
+
+    Returns:
+        json response of data.
+    """
+    return await query_backend("players/all_names")
+
+
+def normalize_name(name:str):
+    """
+    Return a name in the form used by the search index. Accents are removed, word separators become spaces,
+    any other punctuation is removed, and the name is lowercased.
+
+    Example: 'Tim Stützle' -> 'tim stutzle', 'Jean-Gabriel Pageau' -> 'jean gabriel pageau', "Ryan O'Reilly" -> 'ryan oreilly'
+
+    Args:
+        name (str): Player name or search text.
+
+    Returns:
+        str: Normalized name.
+    """
+    name = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode("ascii")
+    name = re.sub(r"[-_/,]", " ", name.lower())
+    name = re.sub(r"[^\w\s]", "", name)
+    return " ".join(name.split())
+
+
+def build_name_index(players:list):
+    """
+    Build a sorted prefix index of player names.
+    Each player is indexed by their full name and by the name starting at each later word so last names match too.
+
+    Args:
+        players (list[dict]): json data of players with 'id' and 'name'.
+
+    Returns:
+        tuple: sorted list of index keys, list of dropdown options matching each key.
+    """
+    entries = []
+    for player in players:
+        normalized = normalize_name(player["name"])
+        # the dropdown also filters options in the browser with 'search', keep normalized matches visible
+        option = {"label": player["name"], "value": player["id"], "search": f"{player['name']} {normalized}"}
+        words = normalized.split(" ")
+        for i in range(len(words)):
+            entries.append((" ".join(words[i:]), i, option["label"], option))
+
+    # full name matches come before later word matches of the same key
+    entries.sort(key=lambda entry: entry[:3])
+    return [entry[0] for entry in entries], [entry[3] for entry in entries]
+
+
+def get_name_index():
+    """
+    Return the prefix index of all player names, building it on first use.
+
+    Returns:
+        tuple: sorted list of index keys, list of dropdown options matching each key.
+    """
+    index = name_index_cache.get("players/all_names")
+    if index is None:
+        index = build_name_index(run(query_all_player_names()))
+        name_index_cache.set("players/all_names", index)
+
+    return index
+
+
+def search_players(search_value:str, limit=PLAYER_SEARCH_LIMIT):
+    """
+    Return dropdown options of players whose full name or any later part of their name starts with search_value.
+
+    Args:
+        search_value (str): Text typed in the player search.
+        limit (int): Maximum number of options to return.
+
+    Returns:
+        list[dict]: Dropdown options with the player name as label, id as value, and the names matched in the browser as search.
+    """
+    prefix = normalize_name(search_value)
+    if not prefix:
+        return []
+
+    keys, options = get_name_index()
+    results = []
+    seen = set()
+    i = bisect_left(keys, prefix)
+    while i < len(keys) and keys[i].startswith(prefix) and len(results) < limit:
+        if options[i]["value"] not in seen:
+            seen.add(options[i]["value"])
+            results.append(options[i])
+        i += 1
+
+    return results